@@ -0,0 +1,126 @@
+"""Vectorised evaluation of many positions at once (requires NumPy).
+
+Positions are encoded as arrays of piece codes, the same codes as
+``Position.mailbox``: shape ``(N, 64)``, ``-1`` for an empty square and
+``color * 6 + piece_type`` otherwise, square 0 being a8.  The one-hot form
+``(N, 12, 64)`` has one plane per piece code.  :func:`evaluate_batch`
+accepts either and returns exactly what
+:func:`chess_engine.evaluate.evaluate_position` returns for each position.
+
+Only the board is encoded; side to move, castling rights and the en passant
+square are given separately when decoding back to FEN.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Union
+
+import numpy as np
+
+from .evaluate import TYPE_VALUES
+from .position import Position
+from . import pst
+from .pst import MAX_PHASE, PIECE_PHASES, PIECE_SCORES, unpack
+from .rules import GameState
+
+# Row 12 stands for an empty square so codes can index the tables directly.
+_EMPTY_ROW = 12
+
+
+def _tables():
+    mg = np.zeros((13, 64), dtype=np.int64)
+    eg = np.zeros((13, 64), dtype=np.int64)
+    for piece in range(12):
+        for sq in range(64):
+            mg[piece, sq], eg[piece, sq] = unpack(PIECE_SCORES[piece * 64 + sq])
+    phase = np.array(PIECE_PHASES + [0], dtype=np.int64)
+    material = np.array(TYPE_VALUES[:5] + [0] + [-v for v in TYPE_VALUES[:5]] + [0, 0], dtype=np.int64)
+    return mg, eg, phase, material
+
+
+MG_TABLE, EG_TABLE, PHASE_TABLE, MATERIAL_TABLE = _tables()
+_TABLES_VERSION = pst.TABLES_VERSION
+
+
+def _refresh_tables():
+    """Rebuild the tables after :func:`chess_engine.pst.load_tables`."""
+    global MG_TABLE, EG_TABLE, PHASE_TABLE, MATERIAL_TABLE, _TABLES_VERSION
+    if _TABLES_VERSION != pst.TABLES_VERSION:
+        MG_TABLE, EG_TABLE, PHASE_TABLE, MATERIAL_TABLE = _tables()
+        _TABLES_VERSION = pst.TABLES_VERSION
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+
+def encode_position(pos: Position) -> np.ndarray:
+    return np.array(pos.mailbox, dtype=np.int8)
+
+
+def encode(positions: Iterable[Union[Position, GameState, str]]) -> np.ndarray:
+    """Encode positions, game states or FEN strings as an ``(N, 64)`` code array."""
+    rows: List[List[int]] = []
+    for item in positions:
+        if isinstance(item, str):
+            item = Position.from_fen(item)
+        elif isinstance(item, GameState):
+            item = item.position
+        rows.append(item.mailbox)
+    return np.array(rows, dtype=np.int8).reshape(len(rows), 64)
+
+
+def decode(codes: np.ndarray, fields: str = "w - - 0 1") -> List[str]:
+    """FEN strings for an ``(N, 64)`` code array; ``fields`` completes each FEN."""
+    fens = []
+    for row in np.asarray(codes).reshape(-1, 64):
+        pos = Position()
+        for sq in np.flatnonzero(row >= 0):
+            pos.put(int(sq), int(row[sq]))
+        fens.append(pos.fen().split(" ", 1)[0] + " " + fields)
+    return fens
+
+
+def to_planes(codes: np.ndarray) -> np.ndarray:
+    """One-hot ``(N, 12, 64)`` planes for an ``(N, 64)`` code array."""
+    codes = np.asarray(codes).reshape(-1, 64)
+    return (codes[:, None, :] == np.arange(12, dtype=codes.dtype)[None, :, None]).astype(np.uint8)
+
+
+def from_planes(planes: np.ndarray) -> np.ndarray:
+    """Inverse of :func:`to_planes`."""
+    planes = np.asarray(planes).reshape(-1, 12, 64)
+    codes = np.argmax(planes, axis=1).astype(np.int8)
+    codes[planes.sum(axis=1) == 0] = -1
+    return codes
+
+
+def _codes(batch: np.ndarray) -> np.ndarray:
+    batch = np.asarray(batch)
+    if batch.ndim == 3 or (batch.ndim == 2 and batch.shape[-1] == 12 * 64):
+        return from_planes(batch)
+    return batch.reshape(-1, 64)
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+
+def evaluate_batch(batch: np.ndarray) -> np.ndarray:
+    """Tapered piece-square score of every position, from white's point of view."""
+    _refresh_tables()
+    index = _codes(batch).astype(np.intp)
+    index[index < 0] = _EMPTY_ROW
+    squares = np.arange(64)
+    mg = MG_TABLE[index, squares].sum(axis=1)
+    eg = EG_TABLE[index, squares].sum(axis=1)
+    phase = np.minimum(PHASE_TABLE[index].sum(axis=1), MAX_PHASE)
+    return (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+
+
+def material_batch(batch: np.ndarray) -> np.ndarray:
+    """Material balance of every position using ``evaluate.PIECE_VALUES``."""
+    index = _codes(batch).astype(np.intp)
+    index[index < 0] = _EMPTY_ROW
+    return MATERIAL_TABLE[index].sum(axis=1)
@@ -0,0 +1,162 @@
+"""Bitboard primitives and precomputed attack tables.
+
+Squares are numbered ``r * 8 + c`` using the same row/column layout as the
+pygame board in ``chess.py``: square 0 is a8, square 7 is h8 and square 63
+is h1.  Bit ``n`` of a bitboard is set when square ``n`` is in the set, so
+white pawns advance towards lower square numbers.
+"""
+from __future__ import annotations
+
+from typing import Dict, List
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+EMPTY = -1  # mailbox value of an empty square
+NO_SQUARE = -1
+
+FULL = (1 << 64) - 1
+
+# Piece codes are ``color * 6 + piece_type`` so that white pieces are 0-5
+# and black pieces 6-11.
+PIECE_NAMES = [c + p for c in ("w", "b") for p in "PNBRQK"]
+PIECE_CODES = {name: code for code, name in enumerate(PIECE_NAMES)}
+FEN_SYMBOLS = "PNBRQKpnbrqk"
+
+# Castling right bits
+CASTLE_WK, CASTLE_WQ, CASTLE_BK, CASTLE_BQ = 1, 2, 4, 8
+CASTLING_SYMBOLS = ((CASTLE_WK, "K"), (CASTLE_WQ, "Q"), (CASTLE_BK, "k"), (CASTLE_BQ, "q"))
+
+FILES = "abcdefgh"
+
+
+def square(r: int, c: int) -> int:
+    return r * 8 + c
+
+
+def square_name(sq: int) -> str:
+    return FILES[sq & 7] + str(8 - (sq >> 3))
+
+
+def parse_square(name: str) -> int:
+    return (8 - int(name[1])) * 8 + FILES.index(name[0])
+
+
+def iter_squares(bb: int):
+    """Yield the square of every set bit, lowest first."""
+    while bb:
+        b = bb & -bb
+        yield b.bit_length() - 1
+        bb ^= b
+
+
+def _on_board(r: int, c: int) -> bool:
+    return 0 <= r < 8 and 0 <= c < 8
+
+
+def _step_attacks(deltas) -> List[int]:
+    table = []
+    for sq in range(64):
+        r, c = divmod(sq, 8)
+        bb = 0
+        for dr, dc in deltas:
+            if _on_board(r + dr, c + dc):
+                bb |= 1 << square(r + dr, c + dc)
+        table.append(bb)
+    return table
+
+
+KNIGHT_ATTACKS = _step_attacks([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = _step_attacks([(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc])
+# PAWN_ATTACKS[color][sq] is the set of squares a pawn of that colour on sq attacks.
+PAWN_ATTACKS = [_step_attacks([(-1, -1), (-1, 1)]), _step_attacks([(1, -1), (1, 1)])]
+
+
+# ---------------------------------------------------------------------------
+# Sliding pieces
+# ---------------------------------------------------------------------------
+
+# Each line is a pair of opposite ray directions: rank, file, diagonal and
+# anti-diagonal.  For every square and line we precompute a dictionary
+# from the relevant blockers on that line to the attacked squares.
+_LINE_DIRECTIONS = (((0, 1), (0, -1)), ((1, 0), (-1, 0)), ((1, 1), (-1, -1)), ((1, -1), (-1, 1)))
+
+
+def _ray(sq: int, dr: int, dc: int) -> List[int]:
+    r, c = divmod(sq, 8)
+    squares = []
+    r, c = r + dr, c + dc
+    while _on_board(r, c):
+        squares.append(square(r, c))
+        r, c = r + dr, c + dc
+    return squares
+
+
+def _build_line(directions):
+    masks: List[int] = []
+    tables: List[Dict[int, int]] = []
+    for sq in range(64):
+        rays = [_ray(sq, dr, dc) for dr, dc in directions]
+        # The last square of a ray is attacked whether or not it is
+        # occupied, so it never needs to be part of the lookup key.
+        mask = 0
+        for ray in rays:
+            for s in ray[:-1]:
+                mask |= 1 << s
+        table: Dict[int, int] = {}
+        sub = 0
+        while True:
+            attacks = 0
+            for ray in rays:
+                for s in ray:
+                    attacks |= 1 << s
+                    if sub >> s & 1:
+                        break
+            table[sub] = attacks
+            sub = (sub - mask) & mask
+            if not sub:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+_RANK_MASK, _RANK_TABLE = _build_line(_LINE_DIRECTIONS[0])
+_FILE_MASK, _FILE_TABLE = _build_line(_LINE_DIRECTIONS[1])
+_DIAG_MASK, _DIAG_TABLE = _build_line(_LINE_DIRECTIONS[2])
+_ANTI_MASK, _ANTI_TABLE = _build_line(_LINE_DIRECTIONS[3])
+
+
+def rook_attacks(sq: int, occ: int) -> int:
+    return _RANK_TABLE[sq][occ & _RANK_MASK[sq]] | _FILE_TABLE[sq][occ & _FILE_MASK[sq]]
+
+
+def bishop_attacks(sq: int, occ: int) -> int:
+    return _DIAG_TABLE[sq][occ & _DIAG_MASK[sq]] | _ANTI_TABLE[sq][occ & _ANTI_MASK[sq]]
+
+
+def queen_attacks(sq: int, occ: int) -> int:
+    return rook_attacks(sq, occ) | bishop_attacks(sq, occ)
+
+
+def _build_lines():
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for sq in range(64):
+        for directions in _LINE_DIRECTIONS:
+            full = 1 << sq
+            for dr, dc in directions:
+                for s in _ray(sq, dr, dc):
+                    full |= 1 << s
+            for dr, dc in directions:
+                acc = 0
+                for s in _ray(sq, dr, dc):
+                    between[sq][s] = acc
+                    line[sq][s] = full
+                    acc |= 1 << s
+    return between, line
+
+
+# BETWEEN[a][b] holds the squares strictly between two aligned squares and
+# LINE[a][b] the whole board line through them; both are 0 otherwise.
+BETWEEN, LINE = _build_lines()
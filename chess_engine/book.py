@@ -0,0 +1,200 @@
+"""Opening book stored as a sorted binary file.
+
+The file is a 16 byte header followed by fixed size entries::
+
+    header  magic b"CBK1", entry count (uint32), 8 reserved bytes
+    entry   Zobrist key (uint64), move (uint16), weight (uint16)
+
+All integers are little-endian and entries are sorted by key, then move,
+so the moves of a position are found with a binary search over a
+memory-mapped file; nothing is read into memory up front.  Books are
+built from PGN files or from self-play logs with one game per line of
+UCI moves, optionally ending with a result such as ``1-0``::
+
+    python -m chess_engine.book build book.bin --pgn games.pgn --log selfplay.txt
+    python -m chess_engine.book probe book.bin --fen "<FEN>"
+"""
+from __future__ import annotations
+
+import argparse
+import mmap
+import random
+import struct
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .bitboard import WHITE
+from .movegen import legal_moves
+from .notation import RESULTS, read_pgn
+from .position import START_FEN, Position, move_to_uci
+
+MAGIC = b"CBK1"
+HEADER = struct.Struct("<4sI8x")
+ENTRY = struct.Struct("<QHH")
+
+MAX_WEIGHT = 0xFFFF
+
+Game = Tuple[str, List[int], str]  # (start FEN, moves, result)
+
+
+class OpeningBook:
+    """Read-only view of a book file.
+
+    Use as a context manager, or call :meth:`close`, to release the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"{path} is not an opening book")
+        magic, self.size = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or HEADER.size + self.size * ENTRY.size > len(self._data):
+            self.close()
+            raise ValueError(f"{path} is not an opening book")
+
+    def _key_at(self, index: int) -> int:
+        return ENTRY.unpack_from(self._data, HEADER.size + index * ENTRY.size)[0]
+
+    def entries(self, key: int) -> List[Tuple[int, int]]:
+        """``(move, weight)`` pairs stored for ``key``."""
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while lo < self.size:
+            entry_key, move, weight = ENTRY.unpack_from(self._data, HEADER.size + lo * ENTRY.size)
+            if entry_key != key:
+                break
+            found.append((move, weight))
+            lo += 1
+        return found
+
+    def moves(self, pos: Position) -> List[Tuple[int, int]]:
+        """Legal book moves of ``pos`` with their weights."""
+        legal = set(legal_moves(pos))
+        return [(move, weight) for move, weight in self.entries(pos.key) if move in legal and weight]
+
+    def choose(self, pos: Position, rng: Optional[random.Random] = None) -> Optional[int]:
+        """Pick a book move with probability proportional to its weight."""
+        moves = self.moves(pos)
+        if not moves:
+            return None
+        rng = rng or random
+        return rng.choices([m for m, _ in moves], weights=[w for _, w in moves])[0]
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def count_moves(games: Iterable[Game], max_ply: int = 20) -> Dict[Tuple[int, int], int]:
+    """Weight every ``(key, move)`` seen in the first ``max_ply`` plies.
+
+    A move scores 2 when its side went on to win, 1 for a draw or an
+    unknown result and 0 for a loss.
+    """
+    weights: Dict[Tuple[int, int], int] = defaultdict(int)
+    for fen, moves, result in games:
+        pos = Position.from_fen(fen)
+        for move in moves[:max_ply]:
+            if result in ("1-0", "0-1"):
+                score = 2 if (result == "1-0") == (pos.side == WHITE) else 0
+            else:
+                score = 1
+            weights[pos.key, move] += score
+            pos.make_move(move)
+    return weights
+
+
+def write_book(path: str, weights: Dict[Tuple[int, int], int], min_weight: int = 1) -> int:
+    """Write the entries of ``weights`` to a book file; return the entry count."""
+    entries = sorted((key, move, min(weight, MAX_WEIGHT)) for (key, move), weight in weights.items() if weight >= min_weight)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries)))
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+    return len(entries)
+
+
+def pgn_games(path: str) -> Iterable[Game]:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for tags, moves, result in read_pgn(f.read()):
+            yield tags.get("FEN", START_FEN), moves, result
+
+
+def log_games(path: str) -> Iterable[Game]:
+    """Games from a self-play log: UCI moves from the start position, one game per line.
+
+    As with PGN, a game with an illegal or malformed move is cut short at
+    that move.
+    """
+    with open(path) as f:
+        for line in f:
+            tokens = line.split()
+            result = tokens.pop() if tokens and tokens[-1] in RESULTS else "*"
+            pos = Position.from_fen(START_FEN)
+            moves: List[int] = []
+            for token in tokens:
+                move = {move_to_uci(m): m for m in legal_moves(pos)}.get(token.lower())
+                if move is None:
+                    break
+                moves.append(move)
+                pos.make_move(move)
+            if moves:
+                yield START_FEN, moves, result
+
+
+def build_book(
+    path: str,
+    pgn_files: Iterable[str] = (),
+    log_files: Iterable[str] = (),
+    max_ply: int = 20,
+    min_weight: int = 1,
+) -> int:
+    games: List[Iterable[Game]] = [pgn_games(p) for p in pgn_files] + [log_games(p) for p in log_files]
+    weights: Dict[Tuple[int, int], int] = defaultdict(int)
+    for source in games:
+        for entry, weight in count_moves(source, max_ply).items():
+            weights[entry] += weight
+    return write_book(path, weights, min_weight)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build or query an opening book.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a book from PGN files and self-play logs")
+    build.add_argument("output")
+    build.add_argument("--pgn", action="append", default=[])
+    build.add_argument("--log", action="append", default=[], help="self-play log of UCI moves")
+    build.add_argument("--max-ply", type=int, default=20)
+    build.add_argument("--min-weight", type=int, default=1)
+    probe = commands.add_parser("probe", help="list the book moves of a position")
+    probe.add_argument("book")
+    probe.add_argument("--fen", default=START_FEN)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = build_book(args.output, args.pgn, args.log, args.max_ply, args.min_weight)
+        print(f"wrote {count} entries to {args.output}")
+    else:
+        with OpeningBook(args.book) as book:
+            for move, weight in sorted(book.moves(Position.from_fen(args.fen)), key=lambda e: -e[1]):
+                print(move_to_uci(move), weight)
+
+
+if __name__ == "__main__":
+    main()
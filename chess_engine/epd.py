@@ -0,0 +1,208 @@
+"""Run EPD test suites of best-move positions.
+
+Each EPD line is the first four FEN fields followed by operations such as
+``bm Qxf7+; am Nc3; id "WAC.001";``.  ``bm`` lists the moves that solve the
+position and ``am`` moves that fail it, in SAN (UCI is accepted too).
+Every position is searched by an :class:`AIPlayer` with the same time or
+node budget, spread over a process pool.  A position counts as solved when
+the move played is one of the ``bm`` moves and none of the ``am`` moves.
+Its time to solution is when the search first reported a solving best
+move and kept it until the end.  Nothing here imports pygame.
+
+Example::
+
+    python -m chess_engine.epd wac.epd --time 1 --processes 4
+"""
+from __future__ import annotations
+
+import argparse
+import shlex
+import time
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from .movegen import legal_moves
+from .notation import move_to_san, parse_san
+from .position import Position, move_to_uci, tuple_to_move
+from .rules import GameState
+from .search import AIPlayer
+
+
+@dataclass
+class EPDPosition:
+    fen: str
+    operations: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def id(self) -> str:
+        return " ".join(self.operations.get("id", []))
+
+    def moves(self, opcode: str) -> List[int]:
+        """The moves of a ``bm`` or ``am`` operation as encoded moves.
+
+        Raises ValueError for a move that is not legal in the position.
+        """
+        pos = Position.from_fen(self.fen)
+        legal = {move_to_uci(m): m for m in legal_moves(pos)}
+        moves = []
+        for text in self.operations.get(opcode, []):
+            try:
+                moves.append(parse_san(pos, text))
+            except ValueError:
+                if text not in legal:
+                    raise
+                moves.append(legal[text])
+        return moves
+
+
+def parse_epd(line: str) -> Optional[EPDPosition]:
+    """Parse one EPD line; blank lines and comments give None."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError(f"not an EPD line: {line!r}")
+    operations: Dict[str, List[str]] = {}
+    halfmove, fullmove = "0", "1"
+    for operation in (fields[4] if len(fields) > 4 else "").split(";"):
+        words = shlex.split(operation)
+        if not words:
+            continue
+        opcode, operands = words[0], words[1:]
+        if opcode == "hmvc" and operands:
+            halfmove = operands[0]
+        elif opcode == "fmvn" and operands:
+            fullmove = operands[0]
+        operations[opcode] = operands
+    return EPDPosition(" ".join(fields[:4] + [halfmove, fullmove]), operations)
+
+
+def read_epd(path: str) -> List[EPDPosition]:
+    with open(path) as f:
+        return [p for p in map(parse_epd, f) if p is not None]
+
+
+@dataclass
+class SolveResult:
+    id: str
+    fen: str
+    expected: List[str]
+    move: str
+    solved: bool
+    solution_time: Optional[float]  # seconds until the solving move was found for good
+    depth: int
+    nodes: int
+    seconds: float
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+def solve(
+    position: EPDPosition,
+    time_limit: Optional[float] = None,
+    node_limit: Optional[int] = None,
+    hash_mb: float = 16,
+    reference: bool = False,
+) -> SolveResult:
+    """Search one position with a fresh player and check the move it plays."""
+    best = set(position.moves("bm"))
+    avoid = set(position.moves("am"))
+    state = GameState.from_fen(position.fen)
+    ai = AIPlayer("hard", hash_mb, time_limit, node_limit, reference=reference)
+    found: List[Optional[float]] = [None]
+
+    def good(move: Optional[int]) -> bool:
+        return move is not None and (not best or move in best) and move not in avoid
+
+    def on_iteration(searcher, depth: int, score: int):
+        if not searcher.pv or not good(searcher.pv[0]):
+            found[0] = None
+        elif found[0] is None:
+            found[0] = time.perf_counter() - start
+
+    ai.on_iteration = on_iteration
+    start = time.perf_counter()
+    move = tuple_to_move(ai.choose_move(state))
+    seconds = time.perf_counter() - start
+    ai.close()
+    solved = good(move)
+    if solved and found[0] is None:
+        # Found in an iteration the budget cut short.
+        found[0] = seconds
+    pos = Position.from_fen(position.fen)
+    expected = [move_to_san(pos, m) for m in position.moves("bm")]
+    expected += ["!" + move_to_san(pos, m) for m in position.moves("am")]
+    return SolveResult(
+        position.id,
+        position.fen,
+        expected,
+        move_to_san(pos, move),
+        solved,
+        found[0] if solved else None,
+        ai.last_depth,
+        ai.last_stats.get("total_nodes", 0),
+        seconds,
+    )
+
+
+def _solve(job: Tuple[EPDPosition, Optional[float], Optional[int], float, bool]) -> SolveResult:
+    return solve(*job)
+
+
+def run_suite(
+    positions: List[EPDPosition],
+    time_limit: Optional[float] = None,
+    node_limit: Optional[int] = None,
+    processes: Optional[int] = None,
+    hash_mb: float = 16,
+    reference: bool = False,
+) -> List[SolveResult]:
+    """Solve every position, in parallel unless ``processes`` is 1; results keep the input order."""
+    jobs = [(p, time_limit, node_limit, hash_mb, reference) for p in positions]
+    if processes == 1:
+        return list(map(_solve, jobs))
+    with Pool(processes) as pool:
+        return pool.map(_solve, jobs, chunksize=1)
+
+
+def report(results: List[SolveResult]) -> str:
+    lines = []
+    for i, r in enumerate(results, 1):
+        name = r.id or f"#{i}"
+        solution = f"{r.solution_time:6.2f}s" if r.solution_time is not None else "     - "
+        lines.append(
+            f"{'ok ' if r.solved else 'BAD'} {name:<14} {r.move:<8} expected {' '.join(r.expected):<16} "
+            f"found {solution} depth {r.depth:>2} {r.nodes:>8} nodes {r.nps:>8.0f} nps"
+        )
+    solved = [r for r in results if r.solved]
+    nodes = sum(r.nodes for r in results)
+    seconds = sum(r.seconds for r in results)
+    lines.append(f"solved {len(solved)}/{len(results)}")
+    if solved:
+        lines.append(f"mean time to solution {sum(r.solution_time for r in solved) / len(solved):.2f}s")
+    lines.append(f"{nodes} nodes in {seconds:.2f}s search time, {nodes / seconds if seconds else 0:.0f} nps")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run an EPD suite of best-move positions.")
+    parser.add_argument("files", nargs="+", help="EPD files")
+    parser.add_argument("--time", type=float, default=None, help="seconds per position (default 1 without --nodes)")
+    parser.add_argument("--nodes", type=int, default=None, help="node budget per position")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--hash", type=float, default=16, help="hash table size per search, MB")
+    parser.add_argument("--reference", action="store_true", help="use the reference minimax search")
+    args = parser.parse_args(argv)
+    time_limit = args.time if args.time is not None or args.nodes is not None else 1.0
+    positions = [p for path in args.files for p in read_epd(path)]
+    results = run_suite(positions, time_limit, args.nodes, args.processes, args.hash, args.reference)
+    print(report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
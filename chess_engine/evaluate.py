@@ -0,0 +1,35 @@
+"""Static evaluation of positions, from white's point of view.
+
+The evaluation is a tapered blend of midgame and endgame piece-square
+sums (see :mod:`chess_engine.pst`).  The sums are kept up to date by
+:class:`Position` as moves are made and unmade, so evaluating a leaf costs
+a few arithmetic operations instead of a scan of the board.  Setting
+``DEBUG_EVAL`` (or the ``CHESS_DEBUG_EVAL`` environment variable)
+recomputes the sums from scratch at every call and asserts they match.
+"""
+from __future__ import annotations
+
+import os
+
+from .position import Position
+from .pst import MAX_PHASE, compute_score, unpack
+
+# Piece values for evaluation
+PIECE_VALUES = {"K": 0, "Q": 900, "R": 500, "B": 330, "N": 320, "P": 100}
+
+# The same values indexed by piece type (P, N, B, R, Q, K).
+TYPE_VALUES = [PIECE_VALUES[p] for p in "PNBRQK"]
+
+DEBUG_EVAL = bool(os.environ.get("CHESS_DEBUG_EVAL"))
+
+
+def evaluate_position(pos: Position) -> int:
+    if DEBUG_EVAL:
+        assert (pos.psq, pos.phase) == compute_score(pos), pos.fen()
+    mg, eg = unpack(pos.psq)
+    phase = pos.phase if pos.phase < MAX_PHASE else MAX_PHASE
+    return (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+
+
+def evaluate(state) -> int:
+    return evaluate_position(state.position)
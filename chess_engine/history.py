@@ -0,0 +1,154 @@
+"""Game history as a start position plus a packed move list.
+
+:class:`GameHistory` replaces a list of :class:`GameState` snapshots.  It
+keeps the FEN of the first position, the moves played as 16-bit integers
+and one live position that moves are made on and taken back from, so
+undo is an unmake rather than a copy.  Games are saved as PGN, as the FEN
+of the current position, or in a compact binary form::
+
+    magic b"CGH1", FEN length (uint16), FEN (UTF-8), move count (uint32),
+    moves (uint16 each, little-endian)
+"""
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Union
+
+from .bitboard import WHITE
+from .notation import move_to_san, read_pgn
+from .position import START_FEN, Position, move_to_tuple, move_to_uci, tuple_to_move
+from .rules import GameState, Move, result
+
+MAGIC = b"CGH1"
+_RESULT_TAGS = {"white": "1-0", "black": "0-1", "draw": "1/2-1/2"}
+
+
+class GameHistory:
+    def __init__(self, start_fen: str = START_FEN):
+        self.start_fen = start_fen
+        self.moves = array("H")
+        self.state = GameState.from_fen(start_fen)
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def push(self, move: Union[int, Move]):
+        """Play a legal move given encoded or as a UI tuple; raises ValueError if it is not legal."""
+        if not isinstance(move, int):
+            move = tuple_to_move(move)
+        if move not in {tuple_to_move(m) for m in self.state.legal_moves()}:
+            raise ValueError(f"illegal move {move_to_uci(move)} in {self.fen()}")
+        self.state.position.make_move(move)
+        self.moves.append(move)
+
+    def undo(self) -> Optional[Move]:
+        """Take back the last move and return it, or None at the start."""
+        if not self.moves:
+            return None
+        self.state.position.unmake_move()
+        return move_to_tuple(self.moves.pop())
+
+    def uci_moves(self) -> List[str]:
+        return [move_to_uci(m) for m in self.moves]
+
+    def fen(self) -> str:
+        return self.state.position.fen()
+
+    # -- PGN ---------------------------------------------------------------
+
+    def to_pgn(self, tags: Optional[Dict[str, str]] = None) -> str:
+        outcome = _RESULT_TAGS.get(result(self.state), "*")
+        headers = {"Event": "?", "Site": "?", "Date": "????.??.??", "Round": "?", "White": "?", "Black": "?"}
+        headers.update(tags or {})
+        headers["Result"] = outcome
+        if self.start_fen != START_FEN:
+            headers["SetUp"] = "1"
+            headers["FEN"] = self.start_fen
+        lines = [f'[{key} "{value}"]' for key, value in headers.items()]
+        pos = Position.from_fen(self.start_fen)
+        words = []
+        for move in self.moves:
+            if pos.side == WHITE:
+                words.append(f"{pos.fullmove_number}.")
+            elif not words:
+                words.append(f"{pos.fullmove_number}...")
+            words.append(move_to_san(pos, move))
+            pos.make_move(move)
+        words.append(outcome)
+        movetext = []
+        line = ""
+        for word in words:
+            if line and len(line) + 1 + len(word) > 79:
+                movetext.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        movetext.append(line)
+        return "\n".join(lines) + "\n\n" + "\n".join(movetext) + "\n"
+
+    @classmethod
+    def from_pgn(cls, text: str) -> "GameHistory":
+        """The first game of a PGN string; raises ValueError on an illegal move."""
+        for tags, moves, _ in read_pgn(text, strict=True):
+            history = cls(tags.get("FEN", START_FEN))
+            for move in moves:
+                history.push(move)
+            return history
+        raise ValueError("no game in PGN")
+
+    # -- binary --------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        fen = self.start_fen.encode("utf-8")
+        moves = array("H", self.moves)
+        if sys.byteorder == "big":
+            moves.byteswap()
+        return MAGIC + struct.pack("<H", len(fen)) + fen + struct.pack("<I", len(moves)) + moves.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GameHistory":
+        """Read :meth:`to_bytes` output; raises ValueError if it is truncated, corrupt or illegal."""
+        if len(data) < 6 or data[:4] != MAGIC:
+            raise ValueError("not a binary game record")
+        (fen_len,) = struct.unpack_from("<H", data, 4)
+        offset = 6 + fen_len
+        if len(data) < offset + 4:
+            raise ValueError("truncated game record")
+        (count,) = struct.unpack_from("<I", data, offset)
+        if len(data) != offset + 4 + 2 * count:
+            raise ValueError(f"game record declares {count} moves in {len(data) - offset - 4} bytes")
+        history = cls(data[6:offset].decode("utf-8"))
+        moves = array("H")
+        moves.frombytes(data[offset + 4 : offset + 4 + 2 * count])
+        if sys.byteorder == "big":
+            moves.byteswap()
+        for move in moves:
+            history.push(move)
+        return history
+
+    # -- files ---------------------------------------------------------------
+
+    def save(self, path: str):
+        """Write PGN, FEN or binary depending on the extension (.pgn, .fen, other)."""
+        if path.endswith(".pgn"):
+            with open(path, "w") as f:
+                f.write(self.to_pgn())
+        elif path.endswith(".fen"):
+            with open(path, "w") as f:
+                f.write(self.fen() + "\n")
+        else:
+            with open(path, "wb") as f:
+                f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "GameHistory":
+        if path.endswith(".pgn"):
+            with open(path) as f:
+                return cls.from_pgn(f.read())
+        if path.endswith(".fen"):
+            with open(path) as f:
+                return cls(f.read().strip())
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
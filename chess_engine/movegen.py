@@ -0,0 +1,404 @@
+"""Move generation on bitboard positions."""
+from __future__ import annotations
+
+from typing import List
+
+from .bitboard import (
+    BISHOP,
+    CASTLE_BK,
+    CASTLE_BQ,
+    CASTLE_WK,
+    CASTLE_WQ,
+    FULL,
+    KING,
+    KING_ATTACKS,
+    KNIGHT,
+    KNIGHT_ATTACKS,
+    NO_SQUARE,
+    PAWN,
+    PAWN_ATTACKS,
+    QUEEN,
+    ROOK,
+    WHITE,
+    BETWEEN,
+    LINE,
+    bishop_attacks,
+    rook_attacks,
+)
+from .position import Position
+
+PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+RANK_1 = 0xFF << 56
+RANK_3 = 0xFF << 40
+RANK_6 = 0xFF << 16
+RANK_8 = 0xFF
+
+# (right, rook square, squares that must be empty, squares the king crosses)
+_CASTLES = (
+    (
+        (CASTLE_WK, 63, (1 << 61) | (1 << 62), (60, 61, 62)),
+        (CASTLE_WQ, 56, (1 << 57) | (1 << 58) | (1 << 59), (60, 59, 58)),
+    ),
+    (
+        (CASTLE_BK, 7, (1 << 5) | (1 << 6), (4, 5, 6)),
+        (CASTLE_BQ, 0, (1 << 1) | (1 << 2) | (1 << 3), (4, 3, 2)),
+    ),
+)
+
+
+def attackers(pos: Position, sq: int, by: int, occ: int) -> int:
+    """Return the pieces of colour ``by`` attacking ``sq`` given occupancy ``occ``."""
+    pieces = pos.pieces
+    base = by * 6
+    queens = pieces[base + QUEEN]
+    return (
+        (PAWN_ATTACKS[by ^ 1][sq] & pieces[base + PAWN])
+        | (KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT])
+        | (KING_ATTACKS[sq] & pieces[base + KING])
+        | (bishop_attacks(sq, occ) & (pieces[base + BISHOP] | queens))
+        | (rook_attacks(sq, occ) & (pieces[base + ROOK] | queens))
+    )
+
+
+def is_square_attacked(pos: Position, sq: int, by: int) -> bool:
+    pieces = pos.pieces
+    base = by * 6
+    if PAWN_ATTACKS[by ^ 1][sq] & pieces[base + PAWN]:
+        return True
+    if KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]:
+        return True
+    if KING_ATTACKS[sq] & pieces[base + KING]:
+        return True
+    occ = pos.occupied[0] | pos.occupied[1]
+    queens = pieces[base + QUEEN]
+    if bishop_attacks(sq, occ) & (pieces[base + BISHOP] | queens):
+        return True
+    return bool(rook_attacks(sq, occ) & (pieces[base + ROOK] | queens))
+
+
+def in_check(pos: Position, color: int) -> bool:
+    return is_square_attacked(pos, pos.pieces[color * 6 + KING].bit_length() - 1, color ^ 1)
+
+
+def pseudo_legal_moves(pos: Position) -> List[int]:
+    """Return every move that obeys piece movement rules, ignoring checks."""
+    moves: List[int] = []
+    append = moves.append
+    pieces = pos.pieces
+    us = pos.side
+    them = us ^ 1
+    base = us * 6
+    own = pos.occupied[us]
+    enemy = pos.occupied[them]
+    occ = own | enemy
+    empty = ~occ & FULL
+    not_own = ~own & FULL
+
+    # Pawns
+    pawns = pieces[base + PAWN]
+    if us == WHITE:
+        single = (pawns >> 8) & empty
+        double = ((single & RANK_3) >> 8) & empty
+        promo_rank = RANK_8
+        push = 8
+    else:
+        single = (pawns << 8) & empty
+        double = ((single & RANK_6) << 8) & empty
+        promo_rank = RANK_1
+        push = -8
+    while single:
+        b = single & -single
+        to = b.bit_length() - 1
+        single ^= b
+        frm = to + push
+        if b & promo_rank:
+            for promo in PROMOTIONS:
+                append(frm | (to << 6) | (promo << 12))
+        else:
+            append(frm | (to << 6))
+    while double:
+        b = double & -double
+        to = b.bit_length() - 1
+        double ^= b
+        append((to + 2 * push) | (to << 6))
+    pawn_attacks = PAWN_ATTACKS[us]
+    bb = pawns
+    while bb:
+        b = bb & -bb
+        frm = b.bit_length() - 1
+        bb ^= b
+        targets = pawn_attacks[frm] & enemy
+        while targets:
+            t = targets & -targets
+            to = t.bit_length() - 1
+            targets ^= t
+            if t & promo_rank:
+                for promo in PROMOTIONS:
+                    append(frm | (to << 6) | (promo << 12))
+            else:
+                append(frm | (to << 6))
+    ep = pos.ep
+    if ep != NO_SQUARE:
+        bb = PAWN_ATTACKS[them][ep] & pawns
+        while bb:
+            b = bb & -bb
+            bb ^= b
+            append((b.bit_length() - 1) | (ep << 6))
+
+    # Knights
+    bb = pieces[base + KNIGHT]
+    while bb:
+        b = bb & -bb
+        frm = b.bit_length() - 1
+        bb ^= b
+        targets = KNIGHT_ATTACKS[frm] & not_own
+        while targets:
+            t = targets & -targets
+            targets ^= t
+            append(frm | ((t.bit_length() - 1) << 6))
+
+    # Sliders
+    queens = pieces[base + QUEEN]
+    for bb, attack_fn in (
+        (pieces[base + BISHOP] | queens, bishop_attacks),
+        (pieces[base + ROOK] | queens, rook_attacks),
+    ):
+        while bb:
+            b = bb & -bb
+            frm = b.bit_length() - 1
+            bb ^= b
+            targets = attack_fn(frm, occ) & not_own
+            while targets:
+                t = targets & -targets
+                targets ^= t
+                append(frm | ((t.bit_length() - 1) << 6))
+
+    # King
+    king_bb = pieces[base + KING]
+    if king_bb:
+        frm = king_bb.bit_length() - 1
+        targets = KING_ATTACKS[frm] & not_own
+        while targets:
+            t = targets & -targets
+            targets ^= t
+            append(frm | ((t.bit_length() - 1) << 6))
+        rights = pos.castling
+        if rights:
+            rooks = pieces[base + ROOK]
+            for right, rook_sq, between, path in _CASTLES[us]:
+                if rights & right and not occ & between and rooks >> rook_sq & 1:
+                    if not any(is_square_attacked(pos, s, them) for s in path):
+                        append(path[0] | (path[2] << 6))
+    return moves
+
+
+def legal_moves(pos: Position, captures_only: bool = False) -> List[int]:
+    """Return the legal moves of the side to move.
+
+    With ``captures_only`` only captures and promotions are generated, as
+    needed by quiescence search.
+
+    Checkers and pinned pieces are computed once up front.  In check, only
+    king moves and moves that capture or block the checker are emitted;
+    pinned pieces may only move along the line to their king.  Only en
+    passant, which removes two pieces from a rank at once, is verified by
+    testing the resulting occupancy.
+    """
+    moves: List[int] = []
+    append = moves.append
+    pieces = pos.pieces
+    us = pos.side
+    them = us ^ 1
+    base = us * 6
+    ebase = them * 6
+    own = pos.occupied[us]
+    enemy = pos.occupied[them]
+    occ = own | enemy
+    not_own = enemy if captures_only else ~own & FULL
+    king = pieces[base + KING].bit_length() - 1
+    pawn_attacks = PAWN_ATTACKS[us]
+    enemy_pawns = pieces[ebase + PAWN]
+    enemy_knights = pieces[ebase + KNIGHT]
+    enemy_king = pieces[ebase + KING]
+    enemy_diag = pieces[ebase + BISHOP] | pieces[ebase + QUEEN]
+    enemy_line = pieces[ebase + ROOK] | pieces[ebase + QUEEN]
+
+    # King moves: the king itself is lifted off the board so that it cannot
+    # hide behind its own square from a checking slider.
+    occ_no_king = occ ^ (1 << king)
+    targets = KING_ATTACKS[king] & not_own
+    while targets:
+        t = targets & -targets
+        targets ^= t
+        to = t.bit_length() - 1
+        if (
+            pawn_attacks[to] & enemy_pawns
+            or KNIGHT_ATTACKS[to] & enemy_knights
+            or KING_ATTACKS[to] & enemy_king
+            or bishop_attacks(to, occ_no_king) & enemy_diag
+            or rook_attacks(to, occ_no_king) & enemy_line
+        ):
+            continue
+        append(king | (to << 6))
+
+    checkers = (
+        (pawn_attacks[king] & enemy_pawns)
+        | (KNIGHT_ATTACKS[king] & enemy_knights)
+        | (bishop_attacks(king, occ) & enemy_diag)
+        | (rook_attacks(king, occ) & enemy_line)
+    )
+    if checkers:
+        if checkers & (checkers - 1):
+            return moves  # double check: only the king may move
+        checker = checkers.bit_length() - 1
+        evasion = checkers | BETWEEN[king][checker]
+    else:
+        evasion = FULL
+
+    # Pinned pieces: an enemy slider that would see the king through
+    # exactly one of our pieces pins it.
+    pinned = 0
+    snipers = (bishop_attacks(king, enemy) & enemy_diag) | (rook_attacks(king, enemy) & enemy_line)
+    while snipers:
+        b = snipers & -snipers
+        snipers ^= b
+        blockers = BETWEEN[king][b.bit_length() - 1] & occ
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pinned |= blockers
+    line_through_king = LINE[king]
+
+    # Pawns
+    pawns = pieces[base + PAWN]
+    empty = ~occ & FULL
+    if us == WHITE:
+        promo_rank = RANK_8
+        push = 8
+        free = pawns & ~pinned
+        single = (free >> 8) & empty
+        double = ((single & RANK_3) >> 8) & empty & evasion
+    else:
+        promo_rank = RANK_1
+        push = -8
+        free = pawns & ~pinned
+        single = (free << 8) & empty
+        double = ((single & RANK_6) << 8) & empty & evasion
+    single &= evasion
+    if captures_only:
+        single &= promo_rank
+        double = 0
+    while single:
+        b = single & -single
+        to = b.bit_length() - 1
+        single ^= b
+        frm = to + push
+        if b & promo_rank:
+            for promo in PROMOTIONS:
+                append(frm | (to << 6) | (promo << 12))
+        else:
+            append(frm | (to << 6))
+    while double:
+        b = double & -double
+        to = b.bit_length() - 1
+        double ^= b
+        append((to + 2 * push) | (to << 6))
+    capture_targets = enemy & evasion
+    bb = pawns
+    while bb:
+        b = bb & -bb
+        frm = b.bit_length() - 1
+        bb ^= b
+        targets = pawn_attacks[frm] & capture_targets
+        if b & pinned:
+            allowed = line_through_king[frm]
+            targets &= allowed
+            to = frm - push
+            if empty >> to & 1 and allowed >> to & 1:
+                if evasion >> to & 1:
+                    if (1 << to) & promo_rank:
+                        for promo in PROMOTIONS:
+                            append(frm | (to << 6) | (promo << 12))
+                    elif not captures_only:
+                        append(frm | (to << 6))
+                to2 = to - push
+                if (
+                    not captures_only
+                    and b & (RANK_3 << 8 if us == WHITE else RANK_6 >> 8)
+                    and empty >> to2 & 1
+                    and evasion >> to2 & 1
+                ):
+                    append(frm | (to2 << 6))
+        while targets:
+            t = targets & -targets
+            to = t.bit_length() - 1
+            targets ^= t
+            if t & promo_rank:
+                for promo in PROMOTIONS:
+                    append(frm | (to << 6) | (promo << 12))
+            else:
+                append(frm | (to << 6))
+    ep = pos.ep
+    if ep != NO_SQUARE:
+        bb = PAWN_ATTACKS[them][ep] & pawns
+        cap_bit = 1 << (ep + push)
+        while bb:
+            b = bb & -bb
+            bb ^= b
+            # Lifting both pawns can expose the king along a rank, and the
+            # capture must also deal with any check, so test it directly.
+            new_occ = (occ ^ b ^ cap_bit) | (1 << ep)
+            if (
+                pawn_attacks[king] & enemy_pawns & ~cap_bit
+                or KNIGHT_ATTACKS[king] & enemy_knights
+                or bishop_attacks(king, new_occ) & enemy_diag
+                or rook_attacks(king, new_occ) & enemy_line
+            ):
+                continue
+            append((b.bit_length() - 1) | (ep << 6))
+
+    # Knights: a pinned knight can never move.
+    bb = pieces[base + KNIGHT] & ~pinned
+    target_mask = not_own & evasion
+    while bb:
+        b = bb & -bb
+        frm = b.bit_length() - 1
+        bb ^= b
+        targets = KNIGHT_ATTACKS[frm] & target_mask
+        while targets:
+            t = targets & -targets
+            targets ^= t
+            append(frm | ((t.bit_length() - 1) << 6))
+
+    # Sliders
+    queens = pieces[base + QUEEN]
+    for bb, attack_fn in (
+        (pieces[base + BISHOP] | queens, bishop_attacks),
+        (pieces[base + ROOK] | queens, rook_attacks),
+    ):
+        while bb:
+            b = bb & -bb
+            frm = b.bit_length() - 1
+            bb ^= b
+            targets = attack_fn(frm, occ) & target_mask
+            if b & pinned:
+                targets &= line_through_king[frm]
+            while targets:
+                t = targets & -targets
+                targets ^= t
+                append(frm | ((t.bit_length() - 1) << 6))
+
+    # Castling
+    rights = pos.castling
+    if rights and not checkers and not captures_only:
+        rooks = pieces[base + ROOK]
+        for right, rook_sq, between, path in _CASTLES[us]:
+            if rights & right and not occ & between and rooks >> rook_sq & 1:
+                if not any(is_square_attacked(pos, s, them) for s in path[1:]):
+                    append(path[0] | (path[2] << 6))
+    return moves
+
+
+def has_legal_move(pos: Position) -> bool:
+    """Return True if the side to move has at least one legal move."""
+    return bool(legal_moves(pos))
+
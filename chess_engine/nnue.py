@@ -0,0 +1,177 @@
+"""Learned NNUE-style evaluation (requires NumPy).
+
+The network has one input per piece code and square (768 in all, feature
+``piece * 64 + square`` as in :func:`chess_engine.batch.to_planes`), a
+hidden layer with clipped ReLU and one linear output, read as a white-POV
+score in centipawns.  The hidden layer before activation, the
+accumulator, is the bias plus the weight rows of the pieces on the board.
+A move only changes a few of those rows.  So :class:`NNUEPosition` keeps a
+stack of accumulators that :meth:`~NNUEPosition.make_move` extends by
+adding and subtracting rows and :meth:`~NNUEPosition.unmake_move` pops.
+
+Weights are int16, quantised with the scales ``FT_SCALE`` (accumulator
+units per 1.0) and ``OUT_SCALE`` (output weight units per 1.0), and stored
+in a ``.npz`` file holding ``ft_weight`` (768 x hidden), ``ft_bias``,
+``out_weight`` and ``out_bias`` (int32, in accumulator times output
+units).  ``python -m chess_engine.train_nnue`` trains one from self-play.
+
+Nothing else in the engine imports this module unless an NNUE file is
+asked for, so the engine still runs without NumPy.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from .bitboard import EMPTY, KING, PAWN, ROOK, WHITE
+from .position import Position
+
+INPUTS = 12 * 64
+FT_SCALE = 255
+OUT_SCALE = 64
+# A network output of 1.0 is this many centipawns.
+EVAL_SCALE = 400
+
+
+class Network:
+    def __init__(self, ft_weight: np.ndarray, ft_bias: np.ndarray, out_weight: np.ndarray, out_bias: int):
+        if ft_weight.shape[0] != INPUTS:
+            raise ValueError(f"expected {INPUTS} input rows, got {ft_weight.shape[0]}")
+        self.ft_weight = ft_weight.astype(np.int16)
+        self.ft_bias = ft_bias.astype(np.int16)
+        self.out_weight = out_weight.astype(np.int16)
+        self.out_bias = int(out_bias)
+        # Accumulators are int32 so that sums of many int16 rows cannot wrap.
+        self._rows = self.ft_weight.astype(np.int32)
+        self._bias = self.ft_bias.astype(np.int32)
+        self._out = self.out_weight.astype(np.int64)
+
+    @property
+    def hidden(self) -> int:
+        return self.ft_weight.shape[1]
+
+    # -- files -----------------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: str) -> "Network":
+        with np.load(path) as data:
+            return cls(data["ft_weight"], data["ft_bias"], data["out_weight"], int(data["out_bias"]))
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            ft_weight=self.ft_weight,
+            ft_bias=self.ft_bias,
+            out_weight=self.out_weight,
+            out_bias=np.array(self.out_bias, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_float(cls, ft_weight, ft_bias, out_weight, out_bias: float) -> "Network":
+        """Quantise float weights as trained (accumulator 1.0 = full activation)."""
+
+        def q(values, scale):
+            return np.clip(np.rint(np.asarray(values) * scale), -32768, 32767).astype(np.int16)
+
+        return cls(
+            q(ft_weight, FT_SCALE),
+            q(ft_bias, FT_SCALE),
+            q(out_weight, OUT_SCALE),
+            int(round(out_bias * FT_SCALE * OUT_SCALE)),
+        )
+
+    def to_float(self):
+        """``(ft_weight, ft_bias, out_weight, out_bias)`` as floats, inverse of :meth:`from_float`."""
+        return (
+            self.ft_weight / FT_SCALE,
+            self.ft_bias / FT_SCALE,
+            self.out_weight / OUT_SCALE,
+            self.out_bias / (FT_SCALE * OUT_SCALE),
+        )
+
+    @classmethod
+    def random(cls, hidden: int = 64, seed: Optional[int] = None) -> "Network":
+        """A small untrained network, the starting point for training."""
+        rng = np.random.default_rng(seed)
+        return cls.from_float(
+            rng.normal(0, 0.1, (INPUTS, hidden)),
+            np.full(hidden, 0.5),
+            rng.normal(0, 1 / np.sqrt(hidden), hidden),
+            0.0,
+        )
+
+    # -- evaluation --------------------------------------------------------------
+
+    def refresh(self, pos: Position) -> np.ndarray:
+        """Accumulator of ``pos`` computed from scratch."""
+        features = [piece * 64 + sq for sq, piece in enumerate(pos.mailbox) if piece != EMPTY]
+        return self._bias + self._rows[features].sum(axis=0, dtype=np.int32)
+
+    def score(self, accumulator: np.ndarray) -> int:
+        active = np.clip(accumulator, 0, FT_SCALE)
+        return int((active @ self._out + self.out_bias) * EVAL_SCALE // (FT_SCALE * OUT_SCALE))
+
+    def evaluate(self, pos: Position) -> int:
+        """White-POV score; incremental for an :class:`NNUEPosition` of this network."""
+        if isinstance(pos, NNUEPosition) and pos.network is self:
+            return self.score(pos.accumulators[-1])
+        return self.score(self.refresh(pos))
+
+
+class NNUEPosition(Position):
+    """A :class:`Position` that keeps the accumulator of ``network`` current."""
+
+    __slots__ = ("network", "accumulators")
+
+    @classmethod
+    def from_position(cls, pos: Position, network: Network) -> "NNUEPosition":
+        new = cls.__new__(cls)
+        for name in Position.__slots__:
+            setattr(new, name, getattr(pos, name))
+        new.pieces = pos.pieces[:]
+        new.occupied = pos.occupied[:]
+        new.mailbox = pos.mailbox[:]
+        new.undo_stack = []
+        new.network = network
+        new.accumulators = [network.refresh(new)]
+        return new
+
+    def copy(self) -> "NNUEPosition":
+        return NNUEPosition.from_position(self, self.network)
+
+    def make_move(self, move: int):
+        frm = move & 63
+        to = (move >> 6) & 63
+        promo = move >> 12
+        mailbox = self.mailbox
+        rows = self.network._rows
+        us = self.side
+        piece = mailbox[frm]
+        ptype = piece - 6 * us
+        moved = us * 6 + promo if promo else piece
+        acc = self.accumulators[-1] + (rows[moved * 64 + to] - rows[piece * 64 + frm])
+        captured = mailbox[to]
+        if captured != EMPTY:
+            acc -= rows[captured * 64 + to]
+        elif ptype == PAWN and to == self.ep:
+            cap_sq = to + 8 if us == WHITE else to - 8
+            acc -= rows[mailbox[cap_sq] * 64 + cap_sq]
+        elif ptype == KING and (to - frm == 2 or frm - to == 2):
+            rook_from, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+            rook = us * 6 + ROOK
+            acc += rows[rook * 64 + rook_to] - rows[rook * 64 + rook_from]
+        self.accumulators.append(acc)
+        Position.make_move(self, move)
+
+    def unmake_move(self):
+        self.accumulators.pop()
+        Position.unmake_move(self)
+
+    def make_null_move(self):
+        self.accumulators.append(self.accumulators[-1])
+        Position.make_null_move(self)
+
+    def unmake_null_move(self):
+        self.accumulators.pop()
+        Position.unmake_null_move(self)
@@ -0,0 +1,123 @@
+"""Standard algebraic notation (SAN) and PGN movetext.
+
+SAN is produced from the legal move list of the position, so the
+disambiguation and the check and mate suffixes always agree with the rules
+of :mod:`chess_engine.movegen`.  :func:`read_pgn` splits a PGN file into
+games of encoded moves; comments, variations and NAGs are skipped.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .bitboard import EMPTY, FILES, KING, PAWN, square_name
+from .movegen import in_check, legal_moves
+from .position import PROMOTION_LETTERS, START_FEN, Position
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+_PIECE_LETTERS = "PNBRQK"
+_TAG = re.compile(r'\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]')
+_SAN_SUFFIX = re.compile(r"[+#?!]+$")
+
+
+def move_to_san(pos: Position, move: int, moves: Optional[List[int]] = None) -> str:
+    """SAN for ``move``, which must be legal in ``pos``.
+
+    ``moves`` may pass the legal moves of ``pos`` when already generated.
+    """
+    frm = move & 63
+    to = (move >> 6) & 63
+    promo = move >> 12
+    piece = pos.mailbox[frm]
+    ptype = piece % 6
+    if ptype == KING and abs(to - frm) == 2:
+        san = "O-O" if to > frm else "O-O-O"
+    else:
+        capture = pos.mailbox[to] != EMPTY or (ptype == PAWN and to == pos.ep)
+        if ptype == PAWN:
+            san = FILES[frm & 7] + "x" if capture else ""
+        else:
+            san = _PIECE_LETTERS[ptype]
+            if moves is None:
+                moves = legal_moves(pos)
+            rivals = [m & 63 for m in moves if (m >> 6) & 63 == to and m & 63 != frm and pos.mailbox[m & 63] == piece]
+            if rivals:
+                if all((sq & 7) != (frm & 7) for sq in rivals):
+                    san += FILES[frm & 7]
+                elif all((sq >> 3) != (frm >> 3) for sq in rivals):
+                    san += str(8 - (frm >> 3))
+                else:
+                    san += square_name(frm)
+            if capture:
+                san += "x"
+        san += square_name(to)
+        if promo:
+            san += "=" + PROMOTION_LETTERS[promo]
+    pos.make_move(move)
+    if in_check(pos, pos.side):
+        san += "+" if legal_moves(pos) else "#"
+    pos.unmake_move()
+    return san
+
+
+def san_moves(pos: Position) -> Dict[str, int]:
+    """Map the SAN of every legal move, without check suffix, to the move."""
+    moves = legal_moves(pos)
+    return {_SAN_SUFFIX.sub("", move_to_san(pos, move, moves)): move for move in moves}
+
+
+def parse_san(pos: Position, text: str) -> int:
+    """Encoded move for a SAN string; raises ValueError if it is not legal."""
+    san = _SAN_SUFFIX.sub("", text.strip()).replace("0-0-0", "O-O-O").replace("0-0", "O-O")
+    table = san_moves(pos)
+    if san in table:
+        return table[san]
+    # Accept promotions written without "=", e.g. "e8Q".
+    for key, move in table.items():
+        if key.replace("=", "") == san.replace("=", ""):
+            return move
+    raise ValueError(f"illegal or ambiguous move {text!r} in {pos.fen()}")
+
+
+def _movetext_tokens(text: str) -> Iterator[str]:
+    depth = 0
+    for token in re.findall(r"\{[^}]*\}|;[^\n]*|\(|\)|[^\s(){};]+", text):
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token[0] not in "{;$":
+            # Drop move numbers such as "12." and "12...".
+            token = re.sub(r"^\d+\.+", "", token)
+            if token:
+                yield token
+
+
+def read_pgn(text: str, strict: bool = False) -> Iterator[Tuple[Dict[str, str], List[int], str]]:
+    """Yield ``(tags, moves, result)`` for every game in a PGN string.
+
+    Moves are encoded from the position given by the FEN tag, or the start
+    position.  A game with an illegal move is cut short at that move, or
+    with ``strict`` raises ValueError.
+    """
+    for chunk in re.split(r"\n\s*\n(?=\s*\[)", text.strip()):
+        tags = dict(_TAG.findall(chunk))
+        movetext = _TAG.sub("", chunk)
+        pos = Position.from_fen(tags.get("FEN", START_FEN))
+        moves: List[int] = []
+        result = tags.get("Result", "*")
+        for token in _movetext_tokens(movetext):
+            if token in RESULTS:
+                result = token
+                break
+            try:
+                move = parse_san(pos, token)
+            except ValueError:
+                if strict:
+                    raise
+                break
+            pos.make_move(move)
+            moves.append(move)
+        if moves or tags:
+            yield tags, moves, result
@@ -0,0 +1,130 @@
+"""Move ordering for alpha-beta search.
+
+Moves are tried in this order:
+
+1. the principal-variation move, then the hash move,
+2. captures and promotions, most valuable victim first and least valuable
+   attacker breaking ties (MVV-LVA),
+3. the two killer moves remembered for the current ply,
+4. remaining quiet moves by their history score.
+
+The orderer also counts beta cutoffs so the effect of ordering on the
+search can be measured.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .bitboard import EMPTY, PAWN, QUEEN
+from .position import Position
+
+MAX_PLY = 128
+
+_HASH_SCORE = 1 << 30
+_CAPTURE_SCORE = 1 << 28
+_KILLER_SCORES = (1 << 27, (1 << 27) - 1)
+
+# MVV_LVA[victim][attacker] by piece type; pawn=0 ... king=5.
+MVV_LVA = [[(victim + 1) * 8 - attacker for attacker in range(6)] for victim in range(6)]
+
+
+@dataclass
+class OrderingStats:
+    nodes: int = 0  # nodes that searched at least one move
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    cutoff_index_total: int = 0  # sum of the move index that caused each cutoff
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def average_cutoff_index(self) -> float:
+        return self.cutoff_index_total / self.cutoffs if self.cutoffs else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "average_cutoff_index": self.average_cutoff_index,
+        }
+
+
+class MoveOrderer:
+    def __init__(self):
+        self.killers: List[List[int]] = [[0, 0] for _ in range(MAX_PLY)]
+        # history[side][from | to << 6]
+        self.history: List[List[int]] = [[0] * 4096 for _ in range(2)]
+        self.stats = OrderingStats()
+
+    def new_search(self):
+        """Forget killers and halve history so that recent searches dominate."""
+        for slot in self.killers:
+            slot[0] = slot[1] = 0
+        for table in self.history:
+            for i, value in enumerate(table):
+                if value:
+                    table[i] = value >> 1
+        self.stats = OrderingStats()
+
+    def order(
+        self, pos: Position, moves: List[int], ply: int, hash_move: Optional[int] = None, pv_move: Optional[int] = None
+    ) -> List[int]:
+        mailbox = pos.mailbox
+        ep = pos.ep
+        killer1, killer2 = self.killers[ply] if ply < MAX_PLY else (0, 0)
+        history = self.history[pos.side]
+        scored = []
+        for move in moves:
+            if move == pv_move:
+                score = _HASH_SCORE + 1
+            elif move == hash_move:
+                score = _HASH_SCORE
+            else:
+                to = (move >> 6) & 63
+                victim = mailbox[to]
+                attacker = mailbox[move & 63] % 6
+                if victim != EMPTY:
+                    score = _CAPTURE_SCORE + MVV_LVA[victim % 6][attacker]
+                    if move >> 12:
+                        score += MVV_LVA[move >> 12][PAWN]
+                elif move >> 12:
+                    # Queen promotions rank with captures, under-promotions last.
+                    score = _CAPTURE_SCORE + MVV_LVA[QUEEN][PAWN] if move >> 12 == QUEEN else -1
+                elif attacker == PAWN and to == ep:
+                    score = _CAPTURE_SCORE + MVV_LVA[PAWN][PAWN]
+                elif move == killer1:
+                    score = _KILLER_SCORES[0]
+                elif move == killer2:
+                    score = _KILLER_SCORES[1]
+                else:
+                    score = history[move & 0xFFF]
+            scored.append((score, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
+
+    def is_quiet(self, pos: Position, move: int) -> bool:
+        to = (move >> 6) & 63
+        if pos.mailbox[to] != EMPTY or move >> 12:
+            return False
+        return not (to == pos.ep and pos.mailbox[move & 63] % 6 == PAWN)
+
+    def record_cutoff(self, pos: Position, move: int, depth: int, ply: int, index: int):
+        """Update statistics, killers and history after ``move`` failed high."""
+        stats = self.stats
+        stats.cutoffs += 1
+        stats.cutoff_index_total += index
+        if not index:
+            stats.first_move_cutoffs += 1
+        if not self.is_quiet(pos, move):
+            return
+        if ply < MAX_PLY:
+            slot = self.killers[ply]
+            if slot[0] != move:
+                slot[1] = slot[0]
+                slot[0] = move
+        self.history[pos.side][move & 0xFFF] += depth * depth
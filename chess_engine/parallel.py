@@ -0,0 +1,184 @@
+"""Lazy SMP parallel search.
+
+The main process and ``workers - 1`` helper processes search the same
+position at the same time and share one transposition table placed in
+shared memory.  Helpers never choose a move; their only effect is to fill
+the table so that the main search finds cutoffs and good moves sooner.
+Each helper starts with slightly different history scores so that the
+processes spread out over different parts of the tree.  With one worker
+no helpers are started and the search is exactly the serial search.
+
+Run ``python -m chess_engine.parallel`` to print a speedup-vs-workers
+table for time to reach a fixed depth.
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+import time
+from typing import List, Optional, Tuple
+
+from .ordering import MoveOrderer
+from .position import Position
+from .search import MAX_DEPTH, Searcher
+from .stats import SearchStats
+from .tt import TranspositionTable
+
+BENCH_FENS = [
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "2r3k1/pp3ppp/2n1b3/3p4/3P4/2NB1N2/PP3PPP/2R3K1 w - - 0 20",
+]
+
+
+def _root(pos: Position, network) -> Position:
+    """The position to search, with an NNUE accumulator when a network is used."""
+    if network is None:
+        return pos
+    from .nnue import NNUEPosition
+
+    return NNUEPosition.from_position(pos, network)
+
+
+def _helper_main(buffer, index: int, jobs, done, stop, reference: bool, network):
+    tt = TranspositionTable.from_buffer(buffer)
+    evaluate = network.evaluate if network is not None else None
+    orderer = MoveOrderer()
+    rng = random.Random(index)
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        fen, generation = job
+        tt.generation = generation
+        orderer.new_search()
+        for table in orderer.history:
+            for i in range(len(table)):
+                table[i] += rng.randrange(16)
+        searcher = Searcher(tt, orderer, reference=reference, evaluate=evaluate)
+        searcher.stop_event = stop
+        searcher.iterative_deepening(_root(Position.from_fen(fen), network), MAX_DEPTH)
+        done.put(searcher.nodes)
+
+
+class ParallelSearcher:
+    """Owns the shared table and the helper processes for repeated searches.
+
+    Use as a context manager, or call :meth:`close`, to stop the helpers.
+    """
+
+    def __init__(self, workers: int = 2, hash_mb: float = 64, reference: bool = False, nnue=None):
+        self.workers = max(1, workers)
+        self.reference = reference
+        if isinstance(nnue, str):
+            from .nnue import Network
+
+            nnue = Network.load(nnue)
+        self.network = nnue
+        self.tt = TranspositionTable(hash_mb, shared=self.workers > 1)
+        self.orderer = MoveOrderer()
+        self.last_searcher: Optional[Searcher] = None
+        self.last_nodes = 0  # nodes searched by all processes in the last search
+        self.on_iteration = None  # see Searcher.on_iteration
+        self._helpers: List[Tuple[multiprocessing.Process, multiprocessing.Queue]] = []
+        if self.workers > 1:
+            self._stop = multiprocessing.Event()
+            self._done: multiprocessing.Queue = multiprocessing.Queue()
+            for index in range(1, self.workers):
+                jobs: multiprocessing.Queue = multiprocessing.Queue()
+                proc = multiprocessing.Process(
+                    target=_helper_main,
+                    args=(self.tt.buffer, index, jobs, self._done, self._stop, reference, nnue),
+                    daemon=True,
+                )
+                proc.start()
+                self._helpers.append((proc, jobs))
+
+    def search(
+        self,
+        pos: Position,
+        max_depth: int,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+        stop_event=None,
+        stats: Optional[SearchStats] = None,
+    ) -> Tuple[int, Optional[int], int]:
+        """Search like :meth:`Searcher.iterative_deepening` using every worker.
+
+        ``stats`` collects the statistics of the main thread's search.
+        """
+        self.tt.new_search()
+        self.orderer.new_search()
+        evaluate = self.network.evaluate if self.network is not None else None
+        searcher = Searcher(self.tt, self.orderer, reference=self.reference, evaluate=evaluate)
+        searcher.stop_event = stop_event
+        searcher.stats = stats
+        searcher.on_iteration = self.on_iteration
+        if self._helpers:
+            self._stop.clear()
+            job = (pos.fen(), self.tt.generation)
+            for _, jobs in self._helpers:
+                jobs.put(job)
+        helper_nodes = 0
+        try:
+            result = searcher.iterative_deepening(_root(pos, self.network), max_depth, time_limit, node_limit)
+        finally:
+            if self._helpers:
+                self._stop.set()
+                for _ in self._helpers:
+                    helper_nodes += self._done.get()
+        self.last_searcher = searcher
+        self.last_nodes = searcher.nodes + helper_nodes
+        return result
+
+    def close(self):
+        for _, jobs in self._helpers:
+            jobs.put(None)
+        for proc, _ in self._helpers:
+            proc.join()
+        self._helpers = []
+
+    def __enter__(self) -> "ParallelSearcher":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def benchmark(worker_counts: List[int], depth: int, fens: List[str], hash_mb: float = 64) -> List[dict]:
+    """Time searches of ``fens`` to ``depth`` for each worker count."""
+    rows = []
+    for workers in worker_counts:
+        with ParallelSearcher(workers, hash_mb) as engine:
+            elapsed = 0.0
+            nodes = 0
+            for fen in fens:
+                engine.tt.clear()
+                start = time.perf_counter()
+                engine.search(Position.from_fen(fen), depth)
+                elapsed += time.perf_counter() - start
+                nodes += engine.last_nodes
+        rows.append({"workers": workers, "seconds": elapsed, "nodes": nodes, "nps": nodes / elapsed if elapsed else 0.0})
+    base = rows[0]["seconds"]
+    for row in rows:
+        row["speedup"] = base / row["seconds"] if row["seconds"] else 0.0
+    return rows
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Measure parallel search speedup against worker count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--hash", type=float, default=64, help="transposition table size in MB")
+    parser.add_argument("--fen", action="append", help="position to search (repeatable)")
+    args = parser.parse_args(argv)
+    rows = benchmark(args.workers, args.depth, args.fen or BENCH_FENS, args.hash)
+    print(f"{'workers':>7} {'seconds':>9} {'speedup':>8} {'nodes':>10} {'nps':>9}")
+    for row in rows:
+        print(f"{row['workers']:>7} {row['seconds']:>9.2f} {row['speedup']:>8.2f} {row['nodes']:>10} {row['nps']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Perft: count the leaf nodes of the legal move tree.
+
+Perft counts every legal move sequence of a given length.  Comparing the
+counts with published values checks the move generator and make/unmake.
+Timing the counts measures their throughput.  ``divide`` splits the count
+by root move, which narrows a mismatch down to a single line.
+
+Command line::
+
+    python -m chess_engine.perft --suite [--max-nodes N]
+    python -m chess_engine.perft --fen FEN --depth N [--divide] [--api rules]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .movegen import legal_moves
+from .position import START_FEN, Position, move_to_uci
+from .rules import GameState, apply_move, generate_moves
+
+# (name, FEN, node counts for depth 1, 2, ...)
+SUITE: List[Tuple[str, str, List[int]]] = [
+    ("start", START_FEN, [20, 400, 8902, 197281, 4865609]),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603],
+    ),
+    ("position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238, 674624]),
+    (
+        "position 4",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        [6, 264, 9467, 422333],
+    ),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379, 2103487]),
+    (
+        "position 6",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594],
+    ),
+    ("illegal ep move", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", [18, 92, 1670, 10138, 185429, 1134888]),
+    ("ep capture checks", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", [15, 126, 1928, 13931, 206379, 1440467]),
+    ("short castle checks", "5k2/8/8/8/8/8/8/4K2R w K - 0 1", [15, 66, 1198, 6399, 120330, 661072]),
+    ("long castle checks", "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", [16, 71, 1286, 7418, 141077, 803711]),
+    ("castling rights", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1", [26, 1141, 27826, 1274206]),
+    ("castling prevented", "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1", [44, 1494, 50509, 1720476]),
+    ("promote out of check", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", [11, 133, 1442, 19174, 266199, 3821001]),
+    ("discovered check", "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1", [29, 165, 5160, 31961, 1004658]),
+    ("promote to check", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1", [9, 40, 472, 2661, 38983, 217342]),
+    ("underpromote to check", "8/P1k5/K7/8/8/8/8/8 w - - 0 1", [6, 27, 273, 1329, 18135, 92683]),
+    ("self stalemate", "K1k5/8/P7/8/8/8/8/8 w - - 0 1", [2, 6, 13, 63, 382, 2217]),
+    ("stalemate and mate", "8/k1P5/8/1K6/8/8/8/8 w - - 0 1", [10, 25, 268, 926, 10857, 43261, 567584]),
+]
+
+
+def perft(pos: Position, depth: int) -> int:
+    """Number of legal move sequences of length ``depth`` from ``pos``."""
+    if depth <= 0:
+        return 1
+    moves = legal_moves(pos)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        pos.make_move(move)
+        nodes += perft(pos, depth - 1)
+        pos.unmake_move()
+    return nodes
+
+
+def perft_state(state: GameState, depth: int) -> int:
+    """Perft through the tuple API used by the UI, copying at every node."""
+    if depth <= 0:
+        return 1
+    moves = generate_moves(state)
+    if depth == 1:
+        return len(moves)
+    return sum(perft_state(apply_move(state, move, make_copy=True), depth - 1) for move in moves)
+
+
+def divide(pos: Position, depth: int) -> Dict[str, int]:
+    """Perft count below each root move, keyed by UCI move."""
+    counts = {}
+    for move in legal_moves(pos):
+        pos.make_move(move)
+        counts[move_to_uci(move)] = perft(pos, depth - 1)
+        pos.unmake_move()
+    return counts
+
+
+def run_suite(max_nodes: int = 1_000_000) -> Iterator[Tuple[str, int, int, int, float]]:
+    """Yield ``(name, depth, expected, counted, seconds)`` for each suite entry.
+
+    Each position is searched at the deepest depth whose expected count does
+    not exceed ``max_nodes``.
+    """
+    for name, fen, counts in SUITE:
+        depth = max([d for d, n in enumerate(counts, 1) if n <= max_nodes] or [1])
+        start = time.perf_counter()
+        nodes = perft(Position.from_fen(fen), depth)
+        yield name, depth, counts[depth - 1], nodes, time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Count perft leaf nodes and measure move generation speed.")
+    parser.add_argument("--fen", default=START_FEN)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--divide", action="store_true", help="print the count below every root move")
+    parser.add_argument("--api", choices=("position", "rules"), default="position",
+                        help="count with make/unmake or with generate_moves/apply_move")
+    parser.add_argument("--suite", action="store_true", help="check the bundled positions with known counts")
+    parser.add_argument("--max-nodes", type=int, default=1_000_000, help="deepest suite depth to run")
+    args = parser.parse_args(argv)
+
+    if args.suite:
+        failures = 0
+        total_nodes = 0
+        total_time = 0.0
+        for name, depth, expected, nodes, seconds in run_suite(args.max_nodes):
+            ok = nodes == expected
+            failures += not ok
+            total_nodes += nodes
+            total_time += seconds
+            print(f"{'ok ' if ok else 'BAD'} {name:<22} depth {depth} {nodes:>9} (expected {expected:>9}) {seconds:6.2f}s")
+        print(f"{total_nodes} nodes in {total_time:.2f}s, {total_nodes / total_time:.0f} nodes/s")
+        return 1 if failures else 0
+
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(Position.from_fen(args.fen), args.depth)
+        for move in sorted(counts):
+            print(f"{move}: {counts[move]}")
+        nodes = sum(counts.values())
+    elif args.api == "rules":
+        nodes = perft_state(GameState.from_fen(args.fen), args.depth)
+    else:
+        nodes = perft(Position.from_fen(args.fen), args.depth)
+    seconds = time.perf_counter() - start
+    print(f"nodes {nodes} time {seconds:.2f}s nps {nodes / seconds if seconds else 0:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,522 @@
+"""Bitboard position representation.
+
+A :class:`Position` keeps twelve piece bitboards, per-colour occupancy
+masks and a 64 entry mailbox so that both set operations and "what is on
+this square" lookups are cheap.  Moves are small integers packing the
+from square, the to square and an optional promotion piece type; they are
+played in place with :meth:`Position.make_move` and taken back with
+:meth:`Position.unmake_move`, which also keep the Zobrist ``key`` and the
+piece-square evaluation sums ``psq`` and ``phase`` current.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from .bitboard import (
+    BLACK,
+    CASTLE_BK,
+    CASTLE_BQ,
+    CASTLE_WK,
+    CASTLE_WQ,
+    CASTLING_SYMBOLS,
+    EMPTY,
+    FEN_SYMBOLS,
+    KING,
+    NO_SQUARE,
+    PAWN,
+    PIECE_CODES,
+    PIECE_NAMES,
+    ROOK,
+    WHITE,
+    parse_square,
+    square_name,
+)
+from .pst import PIECE_PHASES, PIECE_SCORES
+from .zobrist import CASTLING_KEYS, EP_KEYS, PIECE_KEYS, SIDE_KEY, compute_key
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Castling right: (king square, king, rook square, rook) that it needs.
+_CASTLING_HOMES = {
+    CASTLE_WK: (60, WHITE * 6 + KING, 63, WHITE * 6 + ROOK),
+    CASTLE_WQ: (60, WHITE * 6 + KING, 56, WHITE * 6 + ROOK),
+    CASTLE_BK: (4, BLACK * 6 + KING, 7, BLACK * 6 + ROOK),
+    CASTLE_BQ: (4, BLACK * 6 + KING, 0, BLACK * 6 + ROOK),
+}
+
+PROMOTION_LETTERS = {1: "N", 2: "B", 3: "R", 4: "Q"}
+PROMOTION_TYPES = {v: k for k, v in PROMOTION_LETTERS.items()}
+
+# Castling rights that survive a move touching the given square.
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[0] &= ~CASTLE_BQ
+CASTLING_MASK[4] &= ~(CASTLE_BK | CASTLE_BQ)
+CASTLING_MASK[7] &= ~CASTLE_BK
+CASTLING_MASK[56] &= ~CASTLE_WQ
+CASTLING_MASK[60] &= ~(CASTLE_WK | CASTLE_WQ)
+CASTLING_MASK[63] &= ~CASTLE_WK
+
+
+# ---------------------------------------------------------------------------
+# Move encoding
+# ---------------------------------------------------------------------------
+
+
+# Undo-record move of a null move ("pass"); a8-a8 is never a real move.
+NULL_MOVE = 0
+
+
+def encode_move(from_sq: int, to_sq: int, promotion: int = 0) -> int:
+    return from_sq | (to_sq << 6) | (promotion << 12)
+
+
+def move_to_tuple(move: int) -> Tuple[int, int, int, int, Optional[str]]:
+    """Convert an encoded move to the ``(r0, c0, r1, c1, promo)`` form."""
+    frm = move & 63
+    to = (move >> 6) & 63
+    promo = move >> 12
+    return (frm >> 3, frm & 7, to >> 3, to & 7, PROMOTION_LETTERS[promo] if promo else None)
+
+
+def tuple_to_move(move: Tuple[int, int, int, int, Optional[str]]) -> int:
+    r0, c0, r1, c1, promo = move
+    return encode_move(r0 * 8 + c0, r1 * 8 + c1, PROMOTION_TYPES[promo] if promo else 0)
+
+
+def move_to_uci(move: int) -> str:
+    promo = move >> 12
+    text = square_name(move & 63) + square_name((move >> 6) & 63)
+    return text + PROMOTION_LETTERS[promo].lower() if promo else text
+
+
+def parse_uci(text: str) -> int:
+    promo = PROMOTION_TYPES[text[4].upper()] if len(text) > 4 else 0
+    return encode_move(parse_square(text[:2]), parse_square(text[2:4]), promo)
+
+
+# Packed moves add what kind of move it is: ``from | to << 6 | code << 12``
+# with a four-bit code, promotions being PROMOTION_CODE + promotion type - 1
+# (plus CAPTURE when they capture).  Plain encoded moves above stay the
+# identity used for comparison, the transposition table and saved games;
+# packed moves are for 16-bit consumers that want the kind of move without
+# looking at the board.
+QUIET = 0
+DOUBLE_PUSH = 1
+KING_CASTLE = 2
+QUEEN_CASTLE = 3
+CAPTURE = 4
+EP_CAPTURE = 5
+PROMOTION_CODE = 8
+
+
+def pack_move(pos: "Position", move: int) -> int:
+    """Packed form of the plain ``move`` in ``pos``, before it is played."""
+    frm = move & 63
+    to = (move >> 6) & 63
+    promo = move >> 12
+    if promo:
+        code = PROMOTION_CODE + promo - 1
+        if pos.mailbox[to] != EMPTY:
+            code |= CAPTURE
+    elif pos.mailbox[to] != EMPTY:
+        code = CAPTURE
+    else:
+        ptype = pos.mailbox[frm] % 6
+        if ptype == PAWN:
+            if to == pos.ep:
+                code = EP_CAPTURE
+            elif to - frm == 16 or frm - to == 16:
+                code = DOUBLE_PUSH
+            else:
+                code = QUIET
+        elif ptype == KING and (to - frm == 2 or frm - to == 2):
+            code = KING_CASTLE if to > frm else QUEEN_CASTLE
+        else:
+            code = QUIET
+    return frm | (to << 6) | (code << 12)
+
+
+def unpack_move(packed: int) -> int:
+    """Plain encoded move of a packed move."""
+    code = packed >> 12
+    if code & PROMOTION_CODE:
+        return (packed & 0xFFF) | (((code & 3) + 1) << 12)
+    return packed & 0xFFF
+
+
+def move_code(packed: int) -> int:
+    return packed >> 12
+
+
+def is_capture(packed: int) -> bool:
+    """True for captures, en passant and capturing promotions."""
+    return bool(packed >> 12 & CAPTURE)
+
+
+def packed_to_tuple(packed: int) -> Tuple[int, int, int, int, Optional[str]]:
+    return move_to_tuple(unpack_move(packed))
+
+
+def tuple_to_packed(pos: "Position", move: Tuple[int, int, int, int, Optional[str]]) -> int:
+    return pack_move(pos, tuple_to_move(move))
+
+
+# ---------------------------------------------------------------------------
+# Position
+# ---------------------------------------------------------------------------
+
+
+class Position:
+    __slots__ = (
+        "pieces",
+        "occupied",
+        "mailbox",
+        "side",
+        "castling",
+        "ep",
+        "halfmove_clock",
+        "fullmove_number",
+        "undo_stack",
+        "key",
+        "psq",
+        "phase",
+    )
+
+    def __init__(self):
+        self.pieces = [0] * 12
+        self.occupied = [0, 0]
+        self.mailbox = [EMPTY] * 64
+        self.side = WHITE
+        self.castling = 0
+        self.ep = NO_SQUARE
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.undo_stack: List[tuple] = []
+        self.key = 0
+        self.psq = 0  # packed midgame/endgame piece-square sum, see pst.py
+        self.phase = 0
+
+    # -- construction -----------------------------------------------------
+
+    @classmethod
+    def initial(cls) -> "Position":
+        return cls.from_fen(START_FEN)
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "Position":
+        """Parse a FEN; fields after the board are optional.
+
+        Raises ValueError unless the board has eight ranks of eight squares
+        and one king per side, and the other fields are well formed.
+        """
+        fields = fen.split()
+        if not 1 <= len(fields) <= 6:
+            raise ValueError(f"FEN needs 1 to 6 fields: {fen!r}")
+        ranks = fields[0].split("/")
+        if len(ranks) != 8:
+            raise ValueError(f"FEN board needs 8 ranks: {fen!r}")
+        pos = cls()
+        sq = 0
+        for rank in ranks:
+            end = sq + 8
+            for ch in rank:
+                if ch in "12345678":
+                    sq += int(ch)
+                elif ch in FEN_SYMBOLS and sq < end:
+                    pos.put(sq, FEN_SYMBOLS.index(ch))
+                    sq += 1
+                else:
+                    raise ValueError(f"bad FEN rank {rank!r}: {fen!r}")
+            if sq != end:
+                raise ValueError(f"bad FEN rank {rank!r}: {fen!r}")
+        if fields[0].count("K") != 1 or fields[0].count("k") != 1:
+            raise ValueError(f"FEN needs one king per side: {fen!r}")
+        side = fields[1] if len(fields) > 1 else "w"
+        if side not in ("w", "b"):
+            raise ValueError(f"bad FEN side to move {side!r}: {fen!r}")
+        pos.side = WHITE if side == "w" else BLACK
+        rights = fields[2] if len(fields) > 2 else "-"
+        if rights != "-" and (not rights or set(rights) - set("KQkq") or len(set(rights)) != len(rights)):
+            raise ValueError(f"bad FEN castling rights {rights!r}: {fen!r}")
+        # Rights whose king or rook has left its square are dropped.
+        pos.castling = 0
+        for bit, sym in CASTLING_SYMBOLS:
+            king_sq, king, rook_sq, rook = _CASTLING_HOMES[bit]
+            if sym in rights and pos.mailbox[king_sq] == king and pos.mailbox[rook_sq] == rook:
+                pos.castling |= bit
+        ep = fields[3] if len(fields) > 3 else "-"
+        if ep != "-" and (len(ep) != 2 or ep[0] not in "abcdefgh" or ep[1] != ("6" if side == "w" else "3")):
+            raise ValueError(f"bad FEN en passant square {ep!r}: {fen!r}")
+        pos.ep = parse_square(ep) if ep != "-" else NO_SQUARE
+        try:
+            pos.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+            pos.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+        except ValueError:
+            raise ValueError(f"bad FEN move counters: {fen!r}") from None
+        if pos.halfmove_clock < 0 or pos.fullmove_number < 1:
+            raise ValueError(f"bad FEN move counters: {fen!r}")
+        pos.key = compute_key(pos)
+        return pos
+
+    @classmethod
+    def from_board(
+        cls,
+        board: List[List[str]],
+        white_to_move: bool = True,
+        castling: str = "KQkq",
+        en_passant: Optional[Tuple[int, int]] = None,
+        halfmove_clock: int = 0,
+        fullmove_number: int = 1,
+    ) -> "Position":
+        """Build a position from the list-of-strings board used by the UI."""
+        pos = cls()
+        for r, row in enumerate(board):
+            for c, piece in enumerate(row):
+                if piece:
+                    pos.put(r * 8 + c, PIECE_CODES[piece])
+        pos.side = WHITE if white_to_move else BLACK
+        pos.castling = sum(bit for bit, sym in CASTLING_SYMBOLS if sym in castling)
+        pos.ep = en_passant[0] * 8 + en_passant[1] if en_passant else NO_SQUARE
+        pos.halfmove_clock = halfmove_clock
+        pos.fullmove_number = fullmove_number
+        pos.key = compute_key(pos)
+        return pos
+
+    def copy(self) -> "Position":
+        pos = Position.__new__(Position)
+        pos.pieces = self.pieces[:]
+        pos.occupied = self.occupied[:]
+        pos.mailbox = self.mailbox[:]
+        pos.side = self.side
+        pos.castling = self.castling
+        pos.ep = self.ep
+        pos.halfmove_clock = self.halfmove_clock
+        pos.fullmove_number = self.fullmove_number
+        pos.undo_stack = []
+        pos.key = self.key
+        pos.psq = self.psq
+        pos.phase = self.phase
+        return pos
+
+    # -- conversion -------------------------------------------------------
+
+    def fen(self) -> str:
+        rows = []
+        for r in range(8):
+            row = ""
+            gap = 0
+            for piece in self.mailbox[r * 8 : r * 8 + 8]:
+                if piece == EMPTY:
+                    gap += 1
+                    continue
+                if gap:
+                    row += str(gap)
+                    gap = 0
+                row += FEN_SYMBOLS[piece]
+            rows.append(row + (str(gap) if gap else ""))
+        return " ".join(
+            [
+                "/".join(rows),
+                "w" if self.side == WHITE else "b",
+                self.castling_string() or "-",
+                square_name(self.ep) if self.ep != NO_SQUARE else "-",
+                str(self.halfmove_clock),
+                str(self.fullmove_number),
+            ]
+        )
+
+    def to_board(self) -> List[List[str]]:
+        board = [["" for _ in range(8)] for _ in range(8)]
+        for sq, piece in enumerate(self.mailbox):
+            if piece != EMPTY:
+                board[sq >> 3][sq & 7] = PIECE_NAMES[piece]
+        return board
+
+    def castling_string(self) -> str:
+        return "".join(sym for bit, sym in CASTLING_SYMBOLS if self.castling & bit)
+
+    def __repr__(self) -> str:
+        return f"Position({self.fen()!r})"
+
+    # -- piece placement --------------------------------------------------
+
+    def put(self, sq: int, piece: int):
+        bit = 1 << sq
+        self.pieces[piece] |= bit
+        self.occupied[piece // 6] |= bit
+        self.mailbox[sq] = piece
+        self.key ^= PIECE_KEYS[piece * 64 + sq]
+        self.psq += PIECE_SCORES[piece * 64 + sq]
+        self.phase += PIECE_PHASES[piece]
+
+    def remove(self, sq: int) -> int:
+        piece = self.mailbox[sq]
+        if piece != EMPTY:
+            bit = 1 << sq
+            self.pieces[piece] ^= bit
+            self.occupied[piece // 6] ^= bit
+            self.mailbox[sq] = EMPTY
+            self.key ^= PIECE_KEYS[piece * 64 + sq]
+            self.psq -= PIECE_SCORES[piece * 64 + sq]
+            self.phase -= PIECE_PHASES[piece]
+        return piece
+
+    def king_square(self, color: int) -> int:
+        return self.pieces[color * 6 + KING].bit_length() - 1
+
+    # -- moves ------------------------------------------------------------
+
+    def make_move(self, move: int):
+        """Play ``move`` in place, recording what :meth:`unmake_move` needs.
+
+        The move is assumed to be pseudo-legal.  The undo record is a tuple
+        of ``(move, captured piece, castling rights, en passant square,
+        halfmove clock, key, psq, phase)``.
+        """
+        frm = move & 63
+        to = (move >> 6) & 63
+        promo = move >> 12
+        pieces = self.pieces
+        occupied = self.occupied
+        mailbox = self.mailbox
+        us = self.side
+        them = us ^ 1
+        piece = mailbox[frm]
+        ptype = piece - 6 * us
+        from_bit = 1 << frm
+        to_bit = 1 << to
+
+        captured = mailbox[to]
+        castling = self.castling
+        ep = self.ep
+        key = self.key
+        psq = self.psq
+        self.undo_stack.append((move, captured, castling, ep, self.halfmove_clock, key, psq, self.phase))
+        psq -= PIECE_SCORES[piece * 64 + frm]
+        key ^= SIDE_KEY ^ PIECE_KEYS[piece * 64 + frm]
+        if ep != NO_SQUARE:
+            key ^= EP_KEYS[ep & 7]
+        if captured != EMPTY:
+            pieces[captured] ^= to_bit
+            occupied[them] ^= to_bit
+            key ^= PIECE_KEYS[captured * 64 + to]
+            psq -= PIECE_SCORES[captured * 64 + to]
+            self.phase -= PIECE_PHASES[captured]
+        elif ptype == PAWN and to == ep:
+            cap_sq = to + 8 if us == WHITE else to - 8
+            cap_bit = 1 << cap_sq
+            cap_piece = mailbox[cap_sq]
+            pieces[cap_piece] ^= cap_bit
+            occupied[them] ^= cap_bit
+            mailbox[cap_sq] = EMPTY
+            key ^= PIECE_KEYS[cap_piece * 64 + cap_sq]
+            psq -= PIECE_SCORES[cap_piece * 64 + cap_sq]
+
+        pieces[piece] ^= from_bit
+        mailbox[frm] = EMPTY
+        if promo:
+            piece = us * 6 + promo
+            self.phase += PIECE_PHASES[promo]
+        pieces[piece] |= to_bit
+        mailbox[to] = piece
+        occupied[us] ^= from_bit | to_bit
+        key ^= PIECE_KEYS[piece * 64 + to]
+        psq += PIECE_SCORES[piece * 64 + to]
+
+        if ptype == KING and (to - frm == 2 or frm - to == 2):
+            rook_from, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+            rook = us * 6 + ROOK
+            rook_bits = (1 << rook_from) | (1 << rook_to)
+            pieces[rook] ^= rook_bits
+            occupied[us] ^= rook_bits
+            mailbox[rook_from] = EMPTY
+            mailbox[rook_to] = rook
+            key ^= PIECE_KEYS[rook * 64 + rook_from] ^ PIECE_KEYS[rook * 64 + rook_to]
+            psq += PIECE_SCORES[rook * 64 + rook_to] - PIECE_SCORES[rook * 64 + rook_from]
+
+        rights = castling & CASTLING_MASK[frm] & CASTLING_MASK[to]
+        if rights != castling:
+            key ^= CASTLING_KEYS[castling] ^ CASTLING_KEYS[rights]
+            self.castling = rights
+        if ptype == PAWN and (to - frm == 16 or frm - to == 16):
+            self.ep = (frm + to) >> 1
+            key ^= EP_KEYS[frm & 7]
+        else:
+            self.ep = NO_SQUARE
+        self.key = key
+        self.psq = psq
+        if ptype == PAWN or captured != EMPTY:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if us == BLACK:
+            self.fullmove_number += 1
+        self.side = them
+
+    def unmake_move(self):
+        """Take back the most recent :meth:`make_move`."""
+        move, captured, castling, ep, halfmove_clock, self.key, self.psq, self.phase = self.undo_stack.pop()
+        frm = move & 63
+        to = (move >> 6) & 63
+        pieces = self.pieces
+        occupied = self.occupied
+        mailbox = self.mailbox
+        them = self.side
+        us = them ^ 1
+        self.side = us
+        self.castling = castling
+        self.ep = ep
+        self.halfmove_clock = halfmove_clock
+        if us == BLACK:
+            self.fullmove_number -= 1
+        from_bit = 1 << frm
+        to_bit = 1 << to
+
+        piece = mailbox[to]
+        pieces[piece] ^= to_bit
+        if move >> 12:
+            piece = us * 6 + PAWN
+        pieces[piece] |= from_bit
+        mailbox[frm] = piece
+        mailbox[to] = captured
+        occupied[us] ^= from_bit | to_bit
+        ptype = piece - 6 * us
+
+        if captured != EMPTY:
+            pieces[captured] |= to_bit
+            occupied[them] |= to_bit
+        elif ptype == PAWN and to == ep:
+            cap_sq = to + 8 if us == WHITE else to - 8
+            cap_bit = 1 << cap_sq
+            pieces[them * 6 + PAWN] |= cap_bit
+            occupied[them] |= cap_bit
+            mailbox[cap_sq] = them * 6 + PAWN
+        elif ptype == KING and (to - frm == 2 or frm - to == 2):
+            rook_from, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+            rook = us * 6 + ROOK
+            rook_bits = (1 << rook_from) | (1 << rook_to)
+            pieces[rook] ^= rook_bits
+            occupied[us] ^= rook_bits
+            mailbox[rook_to] = EMPTY
+            mailbox[rook_from] = rook
+
+    def make_null_move(self):
+        """Pass the turn without moving, for null-move pruning.
+
+        Only the side to move, the en passant square and the key change;
+        take it back with :meth:`unmake_null_move`.
+        """
+        self.undo_stack.append(
+            (NULL_MOVE, EMPTY, self.castling, self.ep, self.halfmove_clock, self.key, self.psq, self.phase)
+        )
+        key = self.key ^ SIDE_KEY
+        if self.ep != NO_SQUARE:
+            key ^= EP_KEYS[self.ep & 7]
+            self.ep = NO_SQUARE
+        self.key = key
+        self.halfmove_clock += 1
+        self.side ^= 1
+
+    def unmake_null_move(self):
+        _, _, _, self.ep, self.halfmove_clock, self.key, _, _ = self.undo_stack.pop()
+        self.side ^= 1
@@ -0,0 +1,175 @@
+"""Game rules in the board-list form used by the pygame UI.
+
+:class:`GameState` is an adapter around a bitboard :class:`Position`.  It
+keeps the original ``board``/``white_to_move``/``castling`` view so the UI
+and save files can keep addressing squares as ``board[r][c]`` while move
+generation runs on bitboards.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from .bitboard import BLACK as BLACK_SIDE
+from .bitboard import WHITE as WHITE_SIDE
+from .movegen import has_legal_move, in_check, is_square_attacked, legal_moves
+from .position import Position, move_to_tuple, tuple_to_move
+
+WHITE, BLACK = "w", "b"
+PIECES = ["K", "Q", "R", "B", "N", "P"]
+
+BOARD_SIZE = 8
+
+Move = Tuple[int, int, int, int, Optional[str]]  # (r0,c0,r1,c1,promotion)
+
+
+def initial_board() -> List[List[str]]:
+    """Return the starting board configuration."""
+    board = [["" for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    for c in range(BOARD_SIZE):
+        board[1][c] = BLACK + "P"
+        board[6][c] = WHITE + "P"
+    pieces = ["R", "N", "B", "Q", "K", "B", "N", "R"]
+    for c, p in enumerate(pieces):
+        board[0][c] = BLACK + p
+        board[7][c] = WHITE + p
+    return board
+
+
+def clone_board(board: List[List[str]]) -> List[List[str]]:
+    return [row[:] for row in board]
+
+
+class GameState:
+    # Legal moves of the position whose Zobrist key is ``_moves_key``.
+    _moves_key: Optional[int] = None
+    _moves: List[Move] = []
+
+    def __init__(
+        self,
+        board: Optional[List[List[str]]] = None,
+        white_to_move: bool = True,
+        castling: str = "KQkq",
+        en_passant: Optional[Tuple[int, int]] = None,
+        halfmove_clock: int = 0,
+        fullmove_number: int = 1,
+    ):
+        self.position = Position.from_board(
+            board if board is not None else initial_board(),
+            white_to_move,
+            castling,
+            en_passant,
+            halfmove_clock,
+            fullmove_number,
+        )
+
+    @classmethod
+    def from_position(cls, position: Position) -> "GameState":
+        state = cls.__new__(cls)
+        state.position = position
+        return state
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "GameState":
+        return cls.from_position(Position.from_fen(fen))
+
+    def copy(self) -> "GameState":
+        return GameState.from_position(self.position.copy())
+
+    def legal_moves(self) -> List[Move]:
+        """Legal moves as tuples, cached until the position changes.
+
+        The returned list is shared between calls and must not be modified.
+        """
+        key = self.position.key
+        if key != self._moves_key:
+            self._moves = [move_to_tuple(m) for m in legal_moves(self.position)]
+            self._moves_key = key
+        return self._moves
+
+    @property
+    def board(self) -> List[List[str]]:
+        """A fresh ``board[r][c]`` snapshot such as ``"wP"`` or ``""``."""
+        return self.position.to_board()
+
+    @property
+    def white_to_move(self) -> bool:
+        return self.position.side == WHITE_SIDE
+
+    @property
+    def castling(self) -> str:
+        return self.position.castling_string()
+
+    @property
+    def en_passant(self) -> Optional[Tuple[int, int]]:
+        ep = self.position.ep
+        return None if ep < 0 else (ep >> 3, ep & 7)
+
+    @property
+    def halfmove_clock(self) -> int:
+        return self.position.halfmove_clock
+
+    @property
+    def fullmove_number(self) -> int:
+        return self.position.fullmove_number
+
+    def to_dict(self) -> dict:
+        return {
+            "board": self.board,
+            "white_to_move": self.white_to_move,
+            "castling": self.castling,
+            "en_passant": self.en_passant,
+            "halfmove_clock": self.halfmove_clock,
+            "fullmove_number": self.fullmove_number,
+        }
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GameState) and self.position.fen() == other.position.fen()
+
+    def __repr__(self) -> str:
+        return f"GameState.from_fen({self.position.fen()!r})"
+
+
+# ---------------------------------------------------------------------------
+# Move generation and rules
+# ---------------------------------------------------------------------------
+
+
+def in_bounds(r: int, c: int) -> bool:
+    return 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE
+
+
+def square_attacked(state: GameState, r: int, c: int, by_white: bool) -> bool:
+    """Return True if square (r,c) is attacked by the given color."""
+    return is_square_attacked(state.position, r * 8 + c, WHITE_SIDE if by_white else BLACK_SIDE)
+
+
+def is_in_check(state: GameState, white: bool) -> bool:
+    return in_check(state.position, WHITE_SIDE if white else BLACK_SIDE)
+
+
+def generate_moves(state: GameState) -> List[Move]:
+    return list(state.legal_moves())
+
+
+def apply_move(state: GameState, move: Move, make_copy: bool = False) -> GameState:
+    """Apply move and return new state."""
+    if make_copy:
+        state = state.copy()
+    state.position.make_move(tuple_to_move(move))
+    return state
+
+
+def position_result(pos: Position, has_moves: Optional[bool] = None) -> Optional[str]:
+    if has_moves is None:
+        has_moves = has_legal_move(pos)
+    if has_moves:
+        if pos.halfmove_clock >= 100:
+            return "draw"
+        return None
+    if in_check(pos, pos.side):
+        return "black" if pos.side == WHITE_SIDE else "white"
+    return "draw"
+
+
+def result(state: GameState) -> Optional[str]:
+    return position_result(state.position, bool(state.legal_moves()))
@@ -0,0 +1,746 @@
+"""Alpha-beta search and the computer player.
+
+The default search is a negamax principal variation search with null-move
+pruning, late move reductions and check extensions.  The plain minimax
+alpha-beta search it replaced is kept as a reference mode
+(``Searcher(reference=True)``) for testing and comparison.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import List, Optional, Tuple
+
+from .bitboard import BISHOP, KNIGHT, QUEEN, ROOK, WHITE
+from .evaluate import evaluate_position
+from .movegen import has_legal_move, in_check, legal_moves
+from .ordering import MAX_PLY, MoveOrderer
+from .position import NULL_MOVE, Position, move_to_tuple, move_to_uci, tuple_to_move
+from .rules import GameState, Move, generate_moves, position_result
+from .see import see
+from .stats import SearchStats, append_json
+from .tt import EXACT, LOWER, UPPER, TranspositionTable
+
+MAX_DEPTH = 64
+
+# Being mated at ply p scores -(MATE_SCORE - p) for the mated side, so
+# shorter mates score higher.  Any score beyond MATE_BOUND is a mate.
+MATE_SCORE = 100_000
+MATE_BOUND = MATE_SCORE - 2 * MAX_PLY
+INFINITE = MATE_SCORE + 1
+DRAW_SCORE = 0
+
+# Nodes searched between checks of the clock and the node budget.
+CHECK_INTERVAL = 256
+
+# Null-move pruning is tried from this depth; the reply is searched
+# NULL_REDUCTION (plus one more from NULL_DEEP_DEPTH) plies shallower.
+NULL_MIN_DEPTH = 3
+NULL_REDUCTION = 2
+NULL_DEEP_DEPTH = 6
+
+# Quiet moves after the first LMR_MIN_INDEX, at depth LMR_MIN_DEPTH or more,
+# are searched one ply shallower (two from LMR_DEEP_INDEX) with a null window.
+LMR_MIN_DEPTH = 3
+LMR_MIN_INDEX = 3
+LMR_DEEP_INDEX = 6
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time or node budget runs out."""
+
+
+def mated_score(pos: Position, ply: int) -> int:
+    """White-POV score of ``pos`` when the side to move is checkmated."""
+    return -(MATE_SCORE - ply) if pos.side == WHITE else MATE_SCORE - ply
+
+
+def score_to_tt(score: int, ply: int) -> int:
+    """Make a mate score relative to the node before storing it."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: int, ply: int) -> int:
+    """Inverse of :func:`score_to_tt` for the node at ``ply``."""
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class Searcher:
+    """Alpha-beta search state shared by the nodes of one search.
+
+    :meth:`iterative_deepening` searches with :meth:`negamax`, or with the
+    reference :meth:`search` when ``reference`` is True, at depth 1, 2, ...
+    until the depth,
+    time or node budget is used up.  The principal variation of each
+    completed iteration is searched first in the next one, and the
+    remaining moves are sorted by a :class:`MoveOrderer`.  Leaves are
+    resolved by a capture-only quiescence search unless ``quiescence`` is
+    False.  Setting ``stop_event`` (anything with an ``is_set`` method)
+    aborts the search as if its budget had run out.  ``on_iteration``, if
+    set, is called as ``on_iteration(searcher, depth, score)`` after every
+    completed iteration, with ``pv`` already updated.  Attaching a
+    :class:`SearchStats` as ``stats`` also counts transposition table probes
+    and fills the collector when the search ends.  ``evaluate`` replaces
+    :func:`evaluate_position` as the white-POV static evaluation.
+    """
+
+    def __init__(
+        self,
+        tt: Optional[TranspositionTable] = None,
+        orderer: Optional[MoveOrderer] = None,
+        quiescence: bool = True,
+        reference: bool = False,
+        evaluate=None,
+    ):
+        self.tt = tt
+        self.evaluate = evaluate if evaluate is not None else evaluate_position
+        self.orderer = orderer if orderer is not None else MoveOrderer()
+        self.quiescence = quiescence
+        self.nodes = 0
+        self.qnodes = 0  # nodes visited by quiescence search
+        self.depth_nodes: List[int] = []  # nodes used by each completed iteration
+        self.depth_times: List[float] = []  # seconds used by each completed iteration
+        self.stats: Optional[SearchStats] = None
+        self.reference = reference
+        self.deadline: Optional[float] = None
+        self.node_limit: Optional[int] = None
+        self.stop_event = None
+        self.on_iteration = None
+        self.pv: List[int] = []
+        self._next_check = math.inf
+        self._follow_pv = False
+        self._root_best: Optional[Tuple[int, int]] = None
+
+    def _check_limits(self):
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout
+        self._next_check = self.nodes + CHECK_INTERVAL
+        if self.node_limit is not None:
+            self._next_check = min(self._next_check, self.node_limit)
+
+    def search(
+        self, pos: Position, depth: int, alpha: int, beta: int, maximizing: bool, ply: int = 0
+    ) -> Tuple[int, Optional[int]]:
+        """Alpha-beta minimax on a bitboard position, returning an encoded move.
+
+        When a transposition table is given, stored bounds from an earlier
+        search at least as deep narrow the window, and the stored best move
+        is searched first.  Checkmate and stalemate are recognised from the
+        move list generated for the node itself.
+        """
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._check_limits()
+        tt = self.tt
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        if tt is not None and ply:
+            entry = tt.probe(pos.key)
+            stats = self.stats
+            if stats is not None:
+                stats.tt_probes += 1
+                stats.tt_hits += entry is not None
+            if entry is not None:
+                tt_depth, bound, score, tt_move = entry
+                score = score_from_tt(score, ply)
+                if tt_depth >= depth:
+                    if bound != EXACT:
+                        if bound == LOWER:
+                            alpha = max(alpha, score)
+                        else:
+                            beta = min(beta, score)
+                    if bound == EXACT or alpha >= beta:
+                        if stats is not None:
+                            stats.tt_cutoffs += 1
+                        return score, tt_move
+        if pos.halfmove_clock >= 100:
+            # Checkmate on the hundredth halfmove still counts as mate.
+            if in_check(pos, pos.side) and not has_legal_move(pos):
+                return mated_score(pos, ply), None
+            return DRAW_SCORE, None
+        if depth == 0:
+            if self.quiescence:
+                return self.quiesce(pos, alpha, beta, maximizing, ply), None
+            return self.evaluate(pos), None
+        pv_move = None
+        if self._follow_pv:
+            if ply < len(self.pv):
+                pv_move = self.pv[ply]
+            else:
+                self._follow_pv = False
+        moves = legal_moves(pos)
+        if not moves:
+            return (mated_score(pos, ply) if in_check(pos, pos.side) else DRAW_SCORE), None
+        orderer = self.orderer
+        moves = orderer.order(pos, moves, ply, tt_move, pv_move)
+        if moves[0] != pv_move:
+            self._follow_pv = False
+        orderer.stats.nodes += 1
+        best_move: Optional[int] = None
+        if maximizing:
+            best = -INFINITE
+            for index, move in enumerate(moves):
+                pos.make_move(move)
+                eval, _ = self.search(pos, depth - 1, alpha, beta, False, ply + 1)
+                pos.unmake_move()
+                self._follow_pv = False
+                if eval > best:
+                    best = eval
+                    best_move = move
+                    if not ply:
+                        self._root_best = (best, move)
+                alpha = max(alpha, eval)
+                if beta <= alpha:
+                    orderer.record_cutoff(pos, move, depth, ply, index)
+                    break
+        else:
+            best = INFINITE
+            for index, move in enumerate(moves):
+                pos.make_move(move)
+                eval, _ = self.search(pos, depth - 1, alpha, beta, True, ply + 1)
+                pos.unmake_move()
+                self._follow_pv = False
+                if eval < best:
+                    best = eval
+                    best_move = move
+                    if not ply:
+                        self._root_best = (best, move)
+                beta = min(beta, eval)
+                if beta <= alpha:
+                    orderer.record_cutoff(pos, move, depth, ply, index)
+                    break
+        if tt is not None:
+            if best <= alpha_orig:
+                bound = UPPER
+            elif best >= beta_orig:
+                bound = LOWER
+            else:
+                bound = EXACT
+            tt.store(pos.key, depth, bound, score_to_tt(best, ply), best_move)
+        return best, best_move
+
+    def quiesce(self, pos: Position, alpha: int, beta: int, maximizing: bool, ply: int) -> int:
+        """Search captures only until the position is quiet.
+
+        The side to move may "stand pat" on the static evaluation instead of
+        capturing, and captures that lose material according to static
+        exchange evaluation are skipped.  In check, every evasion is
+        searched and stand pat is not allowed.
+        """
+        self.nodes += 1
+        self.qnodes += 1
+        if self.nodes >= self._next_check:
+            self._check_limits()
+        checked = in_check(pos, pos.side)
+        if checked:
+            moves = legal_moves(pos)
+            if not moves:
+                return mated_score(pos, ply)
+            best = -INFINITE if maximizing else INFINITE
+        else:
+            best = self.evaluate(pos)
+            if ply >= MAX_PLY:
+                return best
+            if maximizing:
+                if best >= beta:
+                    return best
+                alpha = max(alpha, best)
+            else:
+                if best <= alpha:
+                    return best
+                beta = min(beta, best)
+            moves = legal_moves(pos, captures_only=True)
+        for move in self.orderer.order(pos, moves, ply):
+            if not checked and see(pos, move) < 0:
+                continue
+            pos.make_move(move)
+            score = self.quiesce(pos, alpha, beta, not maximizing, ply + 1)
+            pos.unmake_move()
+            if maximizing:
+                if score > best:
+                    best = score
+                    alpha = max(alpha, score)
+            else:
+                if score < best:
+                    best = score
+                    beta = min(beta, score)
+            if beta <= alpha:
+                break
+        return best
+
+    def negamax(self, pos: Position, depth: int, alpha: int, beta: int, ply: int = 0, null_ok: bool = True) -> Tuple[int, Optional[int]]:
+        """Principal variation search; the score is from the side to move's view.
+
+        The first move of a node is searched with the full window and the
+        rest with a null window, re-searched only when they beat alpha.
+        Late quiet moves are also reduced by a ply or two.  A side in check
+        is searched one ply deeper.  Outside the principal variation, a
+        side with a piece besides pawns that is already at or above beta
+        first passes the turn; if a reduced search still fails high the
+        node is cut.  Transposition table scores stay from white's view so
+        that the table can be shared with the reference search.
+        """
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._check_limits()
+        tt = self.tt
+        white = pos.side == WHITE
+        pv_node = beta - alpha > 1
+        alpha_orig = alpha
+        tt_move = None
+        if tt is not None and ply:
+            entry = tt.probe(pos.key)
+            stats = self.stats
+            if stats is not None:
+                stats.tt_probes += 1
+                stats.tt_hits += entry is not None
+            if entry is not None:
+                tt_depth, bound, score, tt_move = entry
+                score = score_from_tt(score, ply)
+                if not white:
+                    score = -score
+                    if bound != EXACT:
+                        bound = LOWER + UPPER - bound
+                if tt_depth >= depth:
+                    if bound != EXACT:
+                        if bound == LOWER:
+                            alpha = max(alpha, score)
+                        else:
+                            beta = min(beta, score)
+                    if bound == EXACT or alpha >= beta:
+                        if stats is not None:
+                            stats.tt_cutoffs += 1
+                        return score, tt_move
+        checked = in_check(pos, pos.side)
+        if pos.halfmove_clock >= 100:
+            # Checkmate on the hundredth halfmove still counts as mate.
+            if checked and not has_legal_move(pos):
+                return -(MATE_SCORE - ply), None
+            return DRAW_SCORE, None
+        if checked:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            if self.quiescence:
+                return self.quiesce_negamax(pos, alpha, beta, ply), None
+            return (self.evaluate(pos) if white else -self.evaluate(pos)), None
+        pv_move = None
+        if self._follow_pv:
+            if ply < len(self.pv):
+                pv_move = self.pv[ply]
+            else:
+                self._follow_pv = False
+        if (
+            null_ok
+            and not pv_node
+            and not checked
+            and depth >= NULL_MIN_DEPTH
+            and pv_move is None
+            and _has_pieces(pos)
+            and (self.evaluate(pos) if white else -self.evaluate(pos)) >= beta
+        ):
+            reduction = NULL_REDUCTION + (depth >= NULL_DEEP_DEPTH)
+            pos.make_null_move()
+            score = -self.negamax(pos, depth - 1 - reduction, -beta, 1 - beta, ply + 1, False)[0]
+            pos.unmake_null_move()
+            if score >= beta:
+                # A mate found after passing is not proven; report a plain cutoff.
+                return (beta if score >= MATE_BOUND else score), None
+        moves = legal_moves(pos)
+        if not moves:
+            return (-(MATE_SCORE - ply) if checked else DRAW_SCORE), None
+        orderer = self.orderer
+        moves = orderer.order(pos, moves, ply, tt_move, pv_move)
+        if moves[0] != pv_move:
+            self._follow_pv = False
+        orderer.stats.nodes += 1
+        best = -INFINITE
+        best_move: Optional[int] = None
+        for index, move in enumerate(moves):
+            if index:
+                reduce = depth >= LMR_MIN_DEPTH and index >= LMR_MIN_INDEX and not checked and orderer.is_quiet(pos, move)
+            pos.make_move(move)
+            if not index:
+                score = -self.negamax(pos, depth - 1, -beta, -alpha, ply + 1)[0]
+            else:
+                reduction = 0
+                if reduce and not in_check(pos, pos.side):
+                    reduction = 2 if index >= LMR_DEEP_INDEX and depth > 3 else 1
+                score = -self.negamax(pos, depth - 1 - reduction, -alpha - 1, -alpha, ply + 1)[0]
+                if reduction and score > alpha:
+                    score = -self.negamax(pos, depth - 1, -alpha - 1, -alpha, ply + 1)[0]
+                if alpha < score < beta:
+                    score = -self.negamax(pos, depth - 1, -beta, -alpha, ply + 1)[0]
+            pos.unmake_move()
+            self._follow_pv = False
+            if score > best:
+                best = score
+                best_move = move
+                if not ply:
+                    self._root_best = (best if white else -best, move)
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        orderer.record_cutoff(pos, move, depth, ply, index)
+                        break
+        if tt is not None:
+            if best <= alpha_orig:
+                bound = UPPER
+            elif best >= beta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            score = best
+            if not white:
+                score = -score
+                if bound != EXACT:
+                    bound = LOWER + UPPER - bound
+            tt.store(pos.key, depth, bound, score_to_tt(score, ply), best_move)
+        return best, best_move
+
+    def quiesce_negamax(self, pos: Position, alpha: int, beta: int, ply: int) -> int:
+        """:meth:`quiesce` for :meth:`negamax`, scored for the side to move."""
+        self.nodes += 1
+        self.qnodes += 1
+        if self.nodes >= self._next_check:
+            self._check_limits()
+        checked = in_check(pos, pos.side)
+        if checked:
+            moves = legal_moves(pos)
+            if not moves:
+                return -(MATE_SCORE - ply)
+            best = -INFINITE
+        else:
+            best = self.evaluate(pos)
+            if pos.side != WHITE:
+                best = -best
+            if best >= beta or ply >= MAX_PLY:
+                return best
+            alpha = max(alpha, best)
+            moves = legal_moves(pos, captures_only=True)
+        for move in self.orderer.order(pos, moves, ply):
+            if not checked and see(pos, move) < 0:
+                continue
+            pos.make_move(move)
+            score = -self.quiesce_negamax(pos, -beta, -alpha, ply + 1)
+            pos.unmake_move()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    def principal_variation(self, pos: Position, first: int, depth: int) -> List[int]:
+        """Follow best moves from the transposition table, starting with ``first``."""
+        pv = [first]
+        pos.make_move(first)
+        seen = {pos.key}
+        while self.tt is not None and len(pv) < depth:
+            entry = self.tt.probe(pos.key)
+            if entry is None or entry[3] not in legal_moves(pos):
+                break
+            pv.append(entry[3])
+            pos.make_move(entry[3])
+            if pos.key in seen:
+                break
+            seen.add(pos.key)
+        for _ in pv:
+            pos.unmake_move()
+        return pv
+
+    def iterative_deepening(
+        self,
+        pos: Position,
+        max_depth: int,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+    ) -> Tuple[int, Optional[int], int]:
+        """Search deeper until a limit is hit; return ``(score, move, depth)``.
+
+        ``depth`` is the last fully completed iteration.  When the budget
+        runs out part way through an iteration, a root move that already
+        beat the previous best is still returned.
+        """
+        self.nodes = 0
+        self.qnodes = 0
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.node_limit = node_limit
+        limited = time_limit is not None or node_limit is not None or self.stop_event is not None
+        self._next_check = 0 if limited else math.inf
+        self.pv = []
+        self.depth_nodes = []
+        self.depth_times = []
+        start = last = time.perf_counter()
+        maximizing = pos.side == WHITE
+        root_len = len(pos.undo_stack)
+        score = 0
+        move: Optional[int] = None
+        completed = 0
+        for depth in range(1, max_depth + 1):
+            self._follow_pv = True
+            self._root_best = None
+            try:
+                if self.reference:
+                    score, move = self.search(pos, depth, -INFINITE, INFINITE, maximizing)
+                else:
+                    score, move = self.negamax(pos, depth, -INFINITE, INFINITE)
+                    if not maximizing:
+                        score = -score
+            except SearchTimeout:
+                while len(pos.undo_stack) > root_len:
+                    if pos.undo_stack[-1][0] == NULL_MOVE:
+                        pos.unmake_null_move()
+                    else:
+                        pos.unmake_move()
+                if self._root_best is not None:
+                    score, move = self._root_best
+                    if not self.pv or self.pv[0] != move:
+                        self.pv = [move]
+                break
+            completed = depth
+            self.depth_nodes.append(self.nodes - sum(self.depth_nodes))
+            now = time.perf_counter()
+            self.depth_times.append(now - last)
+            last = now
+            if move is None:
+                break
+            self.pv = self.principal_variation(pos, move, depth)
+            if self.on_iteration is not None:
+                self.on_iteration(self, depth, score)
+            if abs(score) >= MATE_BOUND:
+                break
+        if self.stats is not None:
+            self._fill_stats(completed, time.perf_counter() - start)
+        return score, move, completed
+
+    def _fill_stats(self, depth: int, seconds: float):
+        stats = self.stats
+        stats.nodes = self.nodes
+        stats.qnodes = self.qnodes
+        stats.cutoffs = self.orderer.stats.cutoffs
+        stats.first_move_cutoffs = self.orderer.stats.first_move_cutoffs
+        stats.depth = depth
+        stats.depth_nodes = list(self.depth_nodes)
+        stats.depth_times = list(self.depth_times)
+        stats.seconds = seconds
+
+    def effective_branching_factor(self) -> float:
+        """Growth in nodes between the last two completed iterations."""
+        if len(self.depth_nodes) < 2 or not self.depth_nodes[-2]:
+            return 0.0
+        return self.depth_nodes[-1] / self.depth_nodes[-2]
+
+    def statistics(self) -> dict:
+        stats = self.orderer.stats.as_dict()
+        stats["total_nodes"] = self.nodes
+        stats["quiescence_nodes"] = self.qnodes
+        stats["depth_nodes"] = list(self.depth_nodes)
+        stats["effective_branching_factor"] = self.effective_branching_factor()
+        if self.stats is not None:
+            # "nodes" keeps the orderer's meaning; the collector's count is total_nodes.
+            for key, value in self.stats.as_dict().items():
+                stats.setdefault(key, value)
+        return stats
+
+
+def _has_pieces(pos: Position) -> bool:
+    """Whether the side to move has a piece other than pawns and the king.
+
+    Without one, zugzwang is common and passing is no test of the position.
+    """
+    pieces = pos.pieces
+    base = pos.side * 6
+    return bool(pieces[base + KNIGHT] | pieces[base + BISHOP] | pieces[base + ROOK] | pieces[base + QUEEN])
+
+
+def search_position(
+    pos: Position,
+    depth: int,
+    alpha: int,
+    beta: int,
+    maximizing: bool,
+    tt: Optional[TranspositionTable] = None,
+) -> Tuple[int, Optional[int]]:
+    """Fixed-depth alpha-beta search of ``pos``, returning an encoded move."""
+    return Searcher(tt).search(pos, depth, alpha, beta, maximizing)
+
+
+def minimax(
+    state: GameState,
+    depth: int,
+    alpha: int,
+    beta: int,
+    maximizing: bool,
+    tt: Optional[TranspositionTable] = None,
+) -> Tuple[int, Optional[Move]]:
+    score, move = search_position(state.position, depth, alpha, beta, maximizing, tt)
+    return score, move_to_tuple(move) if move is not None else None
+
+
+class AIPlayer:
+    """Computer opponent.
+
+    Without a budget the AI searches to the fixed depth of its difficulty.
+    With ``time_limit`` (seconds) and/or ``node_limit`` it deepens
+    iteratively until the budget runs out and plays the best move found.
+    ``workers`` above one runs a Lazy SMP search in helper processes; call
+    :meth:`close` when the player is no longer needed.  ``book`` is an
+    :class:`OpeningBook` or the path of a book file; while the position is
+    in the book its moves are played without searching.  With ``stats``
+    set, every search collects a :class:`SearchStats` and ``last_stats``
+    carries its counters; ``stats_path`` additionally appends one JSON
+    record per move to that file.  ``reference`` selects the plain
+    minimax search instead of the principal variation search.  ``nnue``
+    is a :class:`~chess_engine.nnue.Network` or the path of its ``.npz``
+    file, used instead of the piece-square evaluation; it needs NumPy.
+    """
+
+    def __init__(
+        self,
+        difficulty: str,
+        hash_mb: float = 16,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+        workers: int = 1,
+        book=None,
+        stats: bool = False,
+        stats_path: Optional[str] = None,
+        reference: bool = False,
+        nnue=None,
+    ):
+        self.depth = {"easy": 1, "medium": 2, "hard": 3}.get(difficulty, 1)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.parallel = None
+        if workers > 1:
+            from .parallel import ParallelSearcher
+
+            self.parallel = ParallelSearcher(workers, hash_mb, reference, self._load_network(nnue))
+            self.tt, self.orderer = self.parallel.tt, self.parallel.orderer
+        else:
+            # Kept between moves so positions searched on earlier turns are reused.
+            self.tt = TranspositionTable(hash_mb)
+            self.orderer = MoveOrderer()
+        if isinstance(book, str):
+            from .book import OpeningBook
+
+            book = OpeningBook(book)
+        self.book = book
+        self.reference = reference
+        self.network = self.parallel.network if self.parallel is not None else self._load_network(nnue)
+        self.stats = stats or stats_path is not None
+        self.stats_path = stats_path
+        self.last_score = 0
+        self.last_depth = 0
+        self.last_pv: List[Move] = []
+        self.last_stats: dict = {}
+        self.last_search_stats: Optional[SearchStats] = None
+        # Passed on as Searcher.on_iteration to every search.
+        self.on_iteration = None
+
+    def choose_move(
+        self,
+        state: GameState,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+        stop_event=None,
+    ) -> Move:
+        """Pick a move for the side to move in ``state``.
+
+        ``stop_event`` cancels the search from another thread; the best
+        move found so far is returned.
+        """
+        moves = generate_moves(state)
+        time_limit = time_limit if time_limit is not None else self.time_limit
+        node_limit = node_limit if node_limit is not None else self.node_limit
+        budgeted = time_limit is not None or node_limit is not None
+        # Only a search below sets it again; book and random moves have none.
+        self.last_search_stats = None
+        if self.book is not None:
+            book_move = self.book.choose(state.position)
+            if book_move is not None:
+                self.last_score, self.last_depth = 0, 0
+                self.last_pv = [move_to_tuple(book_move)]
+                self.last_stats = {"book": True}
+                return self.last_pv[0]
+        if self.depth == 1 and not budgeted:
+            return random.choice(moves)
+        max_depth = MAX_DEPTH if budgeted else self.depth
+        (score, move, depth), searcher = self._search(state.position, max_depth, time_limit, node_limit, stop_event)
+        self.last_score, self.last_depth = score, depth
+        self.last_pv = [move_to_tuple(m) for m in searcher.pv]
+        self.last_stats = searcher.statistics()
+        self.last_search_stats = searcher.stats
+        move = move_to_tuple(move) if move is not None else None
+        if move not in moves:
+            move = random.choice(moves)
+        if self.stats_path is not None:
+            record = {"fen": state.position.fen(), "move": move_to_uci(tuple_to_move(move)), "score": score}
+            record.update(searcher.stats.as_dict())
+            append_json(self.stats_path, record)
+        return move
+
+    def ponder(self, state: GameState, stop_event) -> Optional[Move]:
+        """Search the position after the expected reply until ``stop_event`` is set.
+
+        The expected reply is the second move of the last principal
+        variation.  Nothing is played; the search only fills the
+        transposition table for the next :meth:`choose_move`.  Returns the
+        move pondered on, or None when there is nothing to ponder.
+        """
+        if len(self.last_pv) < 2 or self.last_pv[1] not in generate_moves(state):
+            return None
+        reply = self.last_pv[1]
+        pos = state.position.copy()
+        pos.make_move(tuple_to_move(reply))
+        if position_result(pos) is None:
+            self._search(pos, MAX_DEPTH, None, None, stop_event)
+        return reply
+
+    def _search(self, pos: Position, max_depth: int, time_limit, node_limit, stop_event):
+        stats = SearchStats() if self.stats else None
+        if self.parallel is not None:
+            self.parallel.on_iteration = self.on_iteration
+            result = self.parallel.search(pos, max_depth, time_limit, node_limit, stop_event, stats)
+            return result, self.parallel.last_searcher
+        evaluate = None
+        if self.network is not None:
+            from .nnue import NNUEPosition
+
+            pos = NNUEPosition.from_position(pos, self.network)
+            evaluate = self.network.evaluate
+        self.tt.new_search()
+        self.orderer.new_search()
+        searcher = Searcher(self.tt, self.orderer, reference=self.reference, evaluate=evaluate)
+        searcher.stop_event = stop_event
+        searcher.stats = stats
+        searcher.on_iteration = self.on_iteration
+        return searcher.iterative_deepening(pos, max_depth, time_limit, node_limit), searcher
+
+    @staticmethod
+    def _load_network(nnue):
+        if isinstance(nnue, str):
+            from .nnue import Network
+
+            return Network.load(nnue)
+        return nnue
+
+    def close(self):
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.book is not None:
+            self.book.close()
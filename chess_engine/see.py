@@ -0,0 +1,67 @@
+"""Static exchange evaluation.
+
+:func:`see` plays out the sequence of captures on a single square, each
+side always recapturing with its least valuable attacker and stopping
+when continuing would lose material.  Sliders uncovered by a capture
+(x-rays) join the exchange.  Pins are ignored.
+"""
+from __future__ import annotations
+
+from .bitboard import BISHOP, EMPTY, KING, PAWN, QUEEN, ROOK, bishop_attacks, rook_attacks
+from .evaluate import TYPE_VALUES
+from .movegen import attackers
+from .position import Position
+
+# The king is worth more than anything it could win, so it only takes
+# part in an exchange as the very last capture.
+SEE_VALUES = TYPE_VALUES[:KING] + [20000]
+
+
+def see(pos: Position, move: int) -> int:
+    """Return the material balance of the capture sequence started by ``move``."""
+    frm = move & 63
+    to = (move >> 6) & 63
+    promo = move >> 12
+    pieces = pos.pieces
+    mailbox = pos.mailbox
+    occ = pos.occupied[0] | pos.occupied[1]
+    attacker = mailbox[frm] % 6
+    victim = mailbox[to]
+    from_bit = 1 << frm
+
+    gain = [0] * 32
+    if victim != EMPTY:
+        gain[0] = SEE_VALUES[victim % 6]
+    elif attacker == PAWN and to == pos.ep:
+        gain[0] = SEE_VALUES[PAWN]
+        occ ^= 1 << (to + 8 if pos.side == 0 else to - 8)
+    if promo:
+        gain[0] += SEE_VALUES[promo] - SEE_VALUES[PAWN]
+        attacker = promo
+
+    diagonal = pieces[BISHOP] | pieces[QUEEN] | pieces[6 + BISHOP] | pieces[6 + QUEEN]
+    straight = pieces[ROOK] | pieces[QUEEN] | pieces[6 + ROOK] | pieces[6 + QUEEN]
+    attack_set = attackers(pos, to, 0, occ) | attackers(pos, to, 1, occ)
+    side = pos.side
+    depth = 0
+    while from_bit:
+        depth += 1
+        gain[depth] = SEE_VALUES[attacker] - gain[depth - 1]
+        if max(-gain[depth - 1], gain[depth]) < 0 or depth == 31:
+            break
+        occ ^= from_bit
+        attack_set &= occ
+        attack_set |= (bishop_attacks(to, occ) & diagonal | rook_attacks(to, occ) & straight) & occ
+        side ^= 1
+        from_bit = 0
+        base = side * 6
+        for ptype in range(6):
+            bb = attack_set & pieces[base + ptype]
+            if bb:
+                from_bit = bb & -bb
+                attacker = ptype
+                break
+    while depth > 1:
+        depth -= 1
+        gain[depth - 1] = -max(-gain[depth - 1], gain[depth])
+    return gain[0]
@@ -0,0 +1,60 @@
+"""Per-search statistics.
+
+A :class:`SearchStats` attached to a :class:`~chess_engine.search.Searcher`
+as ``searcher.stats`` counts transposition table probes and hits while the
+search runs.  When the search finishes, the searcher copies in its node
+counts, the time and nodes of every iteration, and the cutoff counts of its
+move orderer.  With no collector attached, the search only pays one
+``is None`` test per table probe.
+
+:func:`append_json` writes one JSON object per line, so a log collected
+over many moves or releases can be compared with ordinary tools.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import List
+
+
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    qnodes: int = 0
+    tt_probes: int = 0
+    tt_hits: int = 0
+    tt_cutoffs: int = 0  # nodes answered by the table without searching
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    depth: int = 0
+    depth_nodes: List[int] = field(default_factory=list)
+    depth_times: List[float] = field(default_factory=list)  # seconds per iteration
+    seconds: float = 0.0
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["nps"] = self.nps
+        data["tt_hit_rate"] = self.tt_hit_rate
+        data["first_move_cutoff_rate"] = self.first_move_cutoff_rate
+        return data
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict())
+
+
+def append_json(path: str, record: dict):
+    """Append ``record`` to a JSON-lines file."""
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.batch import decode, encode, evaluate_batch, from_planes, material_batch, to_planes
+from chess_engine.evaluate import evaluate_position
+from chess_engine.perft import SUITE
+from chess_engine.position import Position
+from chess_engine.rules import GameState
+
+FENS = [fen for _, fen, _ in SUITE]
+
+
+def test_batch_matches_scalar_evaluation():
+    codes = encode(FENS)
+    assert codes.shape == (len(FENS), 64) and codes.dtype == np.int8
+    expected = [evaluate_position(Position.from_fen(fen)) for fen in FENS]
+    assert evaluate_batch(codes).tolist() == expected
+    assert evaluate_batch(to_planes(codes)).tolist() == expected
+    assert material_batch(encode([GameState()])).tolist() == [0]
+    assert material_batch(encode(["4k3/8/8/8/8/8/8/Q3K3 w - - 0 1"])).tolist() == [900]
+
+
+def test_encoding_round_trips():
+    codes = encode(FENS)
+    planes = to_planes(codes)
+    assert planes.shape == (len(FENS), 12, 64)
+    assert np.array_equal(from_planes(planes), codes)
+    boards = [fen.split()[0] for fen in FENS]
+    assert [fen.split()[0] for fen in decode(codes)] == boards
+    assert decode(encode([FENS[0]]), "b KQkq - 0 1") == [boards[0] + " b KQkq - 0 1"]
@@ -0,0 +1,62 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.book import OpeningBook, build_book, log_games
+from chess_engine.position import START_FEN, Position, parse_uci
+from chess_engine.rules import GameState
+from chess_engine.search import AIPlayer
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 1-0
+
+[Result "0-1"]
+
+1. d4 d5 0-1
+"""
+
+
+def test_build_probe_and_weighted_choice(tmp_path):
+    pgn = tmp_path / "games.pgn"
+    pgn.write_text(PGN)
+    log = tmp_path / "selfplay.txt"
+    log.write_text("e2e4 c7c5 1/2-1/2\ne2e4 e7e5 g1f3 b8c6\n")
+    path = str(tmp_path / "book.bin")
+    assert build_book(path, [str(pgn)], [str(log)]) == 6
+    with OpeningBook(path) as book:
+        start = Position.initial()
+        # e4: 2 (win) + 1 (draw) + 1 (unknown); d4 lost and is left out.
+        assert book.moves(start) == [(parse_uci("e2e4"), 4)]
+        start.make_move(parse_uci("e2e4"))
+        assert sorted(book.moves(start)) == sorted([(parse_uci("e7e5"), 1), (parse_uci("c7c5"), 1)])
+        rng = random.Random(1)
+        picks = {book.choose(start, rng) for _ in range(50)}
+        assert picks == {parse_uci("e7e5"), parse_uci("c7c5")}
+        assert book.choose(Position.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1")) is None
+
+
+def test_log_games_stop_at_an_illegal_move(tmp_path):
+    log = tmp_path / "selfplay.txt"
+    log.write_text("e2e4 e7e5 e4e5 g1f3 1-0\nd2d4 0000 d7d5\nzz9 e2e4\ne2e4 e7e5 g1f\n")
+    games = list(log_games(str(log)))
+    assert games == [
+        (START_FEN, [parse_uci("e2e4"), parse_uci("e7e5")], "1-0"),
+        (START_FEN, [parse_uci("d2d4")], "*"),
+        (START_FEN, [parse_uci("e2e4"), parse_uci("e7e5")], "*"),
+    ]
+
+
+def test_ai_plays_from_book(tmp_path):
+    log = tmp_path / "selfplay.txt"
+    log.write_text("g1f3 1-0\n")
+    path = str(tmp_path / "book.bin")
+    build_book(path, log_files=[str(log)])
+    ai = AIPlayer("hard", book=path, stats=True)
+    state = GameState.from_fen("4k3/8/8/8/8/8/8/4K2R w - - 0 1")
+    ai.choose_move(state)
+    assert ai.last_search_stats is not None
+    assert ai.choose_move(GameState()) == (7, 6, 5, 5, None)
+    assert ai.last_stats == {"book": True} and ai.last_search_stats is None
+    ai.close()
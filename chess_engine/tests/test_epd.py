@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.epd import parse_epd, read_epd, report, run_suite
+from chess_engine.position import parse_uci
+
+SUITE = """\
+# back rank, scholar's mate and a hanging queen
+6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - bm Ra8#; id "back rank";
+r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - bm Qxf7#; id "scholar";
+4k3/8/8/3q4/8/8/3R4/3RK3 w - - bm d2d5; am Kf2; id "queen";
+"""
+
+
+def test_parse_epd_operations():
+    position = parse_epd('4k3/8/8/3q4/8/8/3R4/3RK3 w - - bm Rxd5 Rd4; id "two words"; hmvc 7;')
+    assert position.fen == "4k3/8/8/3q4/8/8/3R4/3RK3 w - - 7 1"
+    assert position.id == "two words"
+    assert position.moves("bm") == [parse_uci("d2d5"), parse_uci("d2d4")]
+    assert parse_epd("   ") is None and parse_epd("# comment") is None
+
+
+def test_illegal_epd_moves_raise_value_error():
+    position = parse_epd("4k3/8/8/3q4/8/8/3R4/3RK3 w - - bm d2d5 d1d3; am Qh5;")
+    with pytest.raises(ValueError):
+        position.moves("bm")
+    with pytest.raises(ValueError):
+        position.moves("am")
+
+
+def test_suite_is_solved_within_a_node_budget(tmp_path):
+    path = tmp_path / "suite.epd"
+    path.write_text(SUITE)
+    positions = read_epd(str(path))
+    results = run_suite(positions, node_limit=3000, processes=1)
+    assert [r.id for r in results] == ["back rank", "scholar", "queen"]
+    assert all(r.solved and r.solution_time is not None for r in results)
+    assert results[2].move == "Rxd5" and results[2].expected == ["Rxd5", "!Kf2"]
+    assert results[2].nodes > 0 and results[2].nps > 0
+    assert "solved 3/3" in report(results)
@@ -0,0 +1,44 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.evaluate import evaluate_position
+from chess_engine.movegen import legal_moves
+from chess_engine.perft import SUITE
+from chess_engine.position import Position
+from chess_engine.pst import compute_score, pack, unpack
+
+
+def test_pack_round_trip():
+    for mg, eg in [(0, 0), (-5, 7), (1234, -987), (-30000, 30000)]:
+        assert unpack(pack(mg, eg)) == (mg, eg)
+    assert unpack(pack(3, -4) + pack(-10, 2)) == (-7, -2)
+
+
+def test_incremental_sums_match_full_recompute():
+    rng = random.Random(7)
+    for _, fen, _ in SUITE:
+        pos = Position.from_fen(fen)
+        start = (pos.psq, pos.phase)
+        assert start == compute_score(pos)
+        for _ in range(40):
+            moves = legal_moves(pos)
+            if not moves:
+                break
+            for move in moves:
+                pos.make_move(move)
+                assert (pos.psq, pos.phase) == compute_score(pos), (pos.fen(), move)
+                pos.unmake_move()
+            pos.make_move(rng.choice(moves))
+        while pos.undo_stack:
+            pos.unmake_move()
+        assert (pos.psq, pos.phase) == start
+
+
+def test_evaluation_is_symmetric_and_tapered():
+    assert evaluate_position(Position.initial()) == 0
+    white = Position.from_fen("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1")
+    black = Position.from_fen("4k3/4p3/8/8/8/8/8/4K3 b - - 0 1")
+    assert evaluate_position(white) == -evaluate_position(black) > 0
+    assert white.phase == 0 and Position.initial().phase == 24
@@ -0,0 +1,77 @@
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.history import GameHistory
+from chess_engine.position import START_FEN, parse_uci
+from chess_engine.rules import GameState
+
+SCHOLARS_MATE = ["e2e4", "e7e5", "f1c4", "b8c6", "d1h5", "g8f6", "h5f7"]
+
+
+def play(history, moves):
+    for move in moves:
+        history.push(parse_uci(move))
+
+
+def test_push_and_incremental_undo():
+    history = GameHistory()
+    play(history, SCHOLARS_MATE[:3])
+    history.push((1, 3, 2, 3, None))  # d7d6 as a UI tuple
+    assert len(history) == 4 and history.uci_moves()[-1] == "d7d6"
+    state = history.state
+    assert history.undo() == (1, 3, 2, 3, None)
+    assert history.state is state and len(state.position.undo_stack) == 3
+    while history.undo():
+        pass
+    assert history.fen() == START_FEN and state == GameState()
+
+
+def test_pgn_and_binary_round_trips(tmp_path):
+    history = GameHistory()
+    play(history, SCHOLARS_MATE)
+    pgn = history.to_pgn({"White": "Tester"})
+    assert '[Result "1-0"]' in pgn and "4. Qxf7# 1-0" in pgn
+    assert GameHistory.from_pgn(pgn).uci_moves() == SCHOLARS_MATE
+
+    data = history.to_bytes()
+    assert len(data) == 4 + 2 + len(START_FEN) + 4 + 2 * len(SCHOLARS_MATE)
+    assert GameHistory.from_bytes(data).fen() == history.fen()
+
+    endgame = GameHistory("4k3/8/8/8/8/8/4P3/4K3 b - - 0 1")
+    play(endgame, ["e8d7", "e2e4"])
+    for name in ("game.pgn", "game.bin"):
+        path = str(tmp_path / name)
+        endgame.save(path)
+        loaded = GameHistory.load(path)
+        assert loaded.start_fen == endgame.start_fen and loaded.uci_moves() == ["e8d7", "e2e4"]
+    assert "1... Kd7 2. e4 *" in endgame.to_pgn()
+    endgame.save(str(tmp_path / "game.fen"))
+    assert GameHistory.load(str(tmp_path / "game.fen")).fen() == endgame.fen()
+
+
+def test_corrupt_records_raise_value_error():
+    history = GameHistory()
+    play(history, SCHOLARS_MATE[:3])
+    with pytest.raises(ValueError):
+        history.push(parse_uci("e2e4"))
+    assert len(history) == 3
+
+    data = history.to_bytes()
+    illegal = data[:-2] + struct.pack("<H", parse_uci("a1a8"))
+    for bad in (data[:-1], data + b"\0\0", data[:8], illegal):
+        with pytest.raises(ValueError):
+            GameHistory.from_bytes(bad)
+    with pytest.raises(ValueError):
+        GameHistory.from_pgn(history.to_pgn().replace("Bc4", "Bc5"))
+
+
+def test_corrupt_fen_saves_raise_value_error(tmp_path):
+    path = tmp_path / "game.fen"
+    for fen in ("rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "8/8/8/8 w", "8/8/8/8/8/8/8/8 w - - 0 1"):
+        path.write_text(fen + "\n")
+        with pytest.raises(ValueError):
+            GameHistory.load(str(path))
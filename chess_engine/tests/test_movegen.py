@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.movegen import in_check, legal_moves, pseudo_legal_moves
+from chess_engine.position import Position, move_to_uci
+from chess_engine.rules import GameState, apply_move, generate_moves, result
+
+TRICKY = [
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "4k3/8/8/8/1b6/8/3P4/4K2r w - - 0 1",
+    "8/8/8/8/k2Pp2Q/8/8/3K4 b - d3 0 1",
+]
+
+
+def _filtered(pos):
+    moves = []
+    for move in pseudo_legal_moves(pos):
+        pos.make_move(move)
+        if not in_check(pos, pos.side ^ 1):
+            moves.append(move)
+        pos.unmake_move()
+    return sorted(moves)
+
+
+def test_matches_trial_application():
+    for fen in TRICKY:
+        pos = Position.from_fen(fen)
+        assert sorted(legal_moves(pos)) == _filtered(pos), fen
+
+
+def test_en_passant_discovered_check():
+    pos = Position.from_fen("8/8/8/K2pP2r/8/8/8/7k w - d6 0 1")
+    assert "e5d6" not in map(move_to_uci, legal_moves(pos))
+    pos = Position.from_fen("8/8/8/K2pP3/8/8/8/7k w - d6 0 1")
+    assert "e5d6" in map(move_to_uci, legal_moves(pos))
+
+
+def test_check_evasions_and_pins():
+    # Double check from rook and bishop: only king moves are legal.
+    pos = Position.from_fen("4k3/8/8/8/1b6/8/8/r3K2N w - - 0 1")
+    assert all(move & 63 == pos.king_square(0) for move in legal_moves(pos))
+    # The pinned d2 pawn may only capture its pinner, not push off the line.
+    pos = Position.from_fen("4k3/8/8/8/8/2b5/3P4/4K3 w - - 0 1")
+    assert [u for u in map(move_to_uci, legal_moves(pos)) if u.startswith("d2")] == ["d2c3"]
+
+
+def test_game_state_caches_moves_until_position_changes():
+    state = GameState()
+    moves = state.legal_moves()
+    assert state.legal_moves() is moves and len(moves) == 20
+    assert generate_moves(state) == moves and generate_moves(state) is not moves
+    apply_move(state, (6, 4, 4, 4, None))
+    assert state.legal_moves() is not moves and len(state.legal_moves()) == 20
+    state.position.unmake_move()
+    assert result(state) is None
+    mated = GameState.from_fen("R5k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1")
+    assert result(mated) == "white" and mated.legal_moves() == []
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.batch import encode
+from chess_engine.movegen import legal_moves
+from chess_engine.nnue import Network, NNUEPosition
+from chess_engine.perft import SUITE
+from chess_engine.position import Position
+from chess_engine.rules import GameState, generate_moves
+from chess_engine.search import AIPlayer
+from chess_engine.train_nnue import train
+
+
+def test_accumulator_follows_make_and_unmake():
+    network = Network.random(16, seed=1)
+    for name, fen, _ in SUITE:
+        pos = NNUEPosition.from_position(Position.from_fen(fen), network)
+        start = pos.accumulators[-1].copy()
+        for move in legal_moves(pos):
+            pos.make_move(move)
+            for reply in legal_moves(pos)[:8]:
+                pos.make_move(reply)
+                assert (pos.accumulators[-1] == network.refresh(pos)).all(), name
+                pos.unmake_move()
+            pos.make_null_move()
+            assert network.evaluate(pos) == network.evaluate(Position.from_fen(pos.fen()))
+            pos.unmake_null_move()
+            pos.unmake_move()
+        assert len(pos.accumulators) == 1 and (pos.accumulators[0] == start).all()
+        assert pos.fen() == fen
+
+
+def test_network_file_round_trip_and_search(tmp_path):
+    path = str(tmp_path / "net.npz")
+    network = Network.random(8, seed=2)
+    network.save(path)
+    loaded = Network.load(path)
+    pos = Position.from_fen(SUITE[1][1])
+    assert loaded.evaluate(pos) == network.evaluate(pos)
+    state = GameState.from_fen(SUITE[1][1])
+    ai = AIPlayer("medium", nnue=path)
+    assert ai.choose_move(state) in generate_moves(state)
+    assert state.position.fen() == SUITE[1][1]
+
+
+def test_training_lowers_the_loss():
+    fens = [fen for _, fen, _ in SUITE]
+    codes = encode(fens)
+    scores = np.array([(-1) ** i * 300 for i in range(len(fens))], dtype=np.int32)
+    results = (scores > 0).astype(np.float32)
+    network, losses = train(codes, scores, results, hidden=8, epochs=30, batch_size=4, lr=1e-2)
+    assert losses[-1] < losses[0] / 2
+    assert network.hidden == 8
@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.movegen import legal_moves
+from chess_engine.notation import move_to_san, parse_san, read_pgn
+from chess_engine.perft import SUITE
+from chess_engine.position import Position, parse_uci
+
+PGN = """[Event "Test"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 {main line} Nc6 (2... d6 3. d4) 3. Bb5 a6 $1 4. Ba4 Nf6
+5. O-O Be7 1-0
+
+[Event "Second"]
+[FEN "4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1"]
+
+1. O-O-O+ *
+"""
+
+
+def test_san_round_trip_and_disambiguation():
+    for _, fen, _ in SUITE:
+        pos = Position.from_fen(fen)
+        moves = legal_moves(pos)
+        sans = [move_to_san(pos, m) for m in moves]
+        assert len(set(sans)) == len(sans)
+        assert [parse_san(pos, s) for s in sans] == moves
+    pos = Position.from_fen("R6R/8/4k3/8/8/8/8/R3K3 w - - 0 1")
+    assert move_to_san(pos, parse_uci("a8d8")) == "Rad8"
+    assert move_to_san(pos, parse_uci("a1a4")) == "R1a4"
+    assert move_to_san(pos, parse_uci("e1d2")) == "Kd2"
+    pos = Position.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    assert move_to_san(pos, parse_uci("a1a8")) == "Ra8#"
+    pos = Position.from_fen("8/1P6/8/8/8/8/8/k1K5 w - - 0 1")
+    assert parse_san(pos, "b8Q") == parse_san(pos, "b8=Q+") == parse_uci("b7b8q")
+
+
+def test_read_pgn_skips_comments_and_variations():
+    games = list(read_pgn(PGN))
+    assert len(games) == 2
+    tags, moves, result = games[0]
+    assert tags["Event"] == "Test" and result == "1-0" and len(moves) == 10
+    assert moves[-2:] == [parse_uci("e1g1"), parse_uci("f8e7")]
+    tags, moves, result = games[1]
+    assert moves == [parse_uci("e1c1")] and result == "*"
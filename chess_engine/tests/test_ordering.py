@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.movegen import legal_moves
+from chess_engine.ordering import MoveOrderer
+from chess_engine.position import Position, move_to_uci, parse_uci
+from chess_engine.rules import GameState
+from chess_engine.search import AIPlayer
+
+
+def test_hash_move_then_mvv_lva_then_killers():
+    pos = Position.from_fen("4k3/8/3q1r2/4P3/2N5/8/8/4K3 w - - 0 1")
+    orderer = MoveOrderer()
+    orderer.record_cutoff(pos, parse_uci("e1e2"), 3, 0, 2)
+    moves = orderer.order(pos, legal_moves(pos), 0, hash_move=parse_uci("c4b6"))
+    assert [move_to_uci(m) for m in moves[:5]] == ["c4b6", "e5d6", "c4d6", "e5f6", "e1e2"]
+    assert orderer.stats.cutoffs == 1 and orderer.stats.first_move_cutoffs == 0
+
+
+def test_search_reports_cutoff_statistics():
+    ai = AIPlayer("hard")
+    ai.choose_move(GameState.from_fen("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"))
+    stats = ai.last_stats
+    assert len(stats["depth_nodes"]) == 3
+    assert stats["cutoffs"] > 0 and stats["first_move_cutoff_rate"] > 0.5
+    assert stats["effective_branching_factor"] > 0
@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.parallel import ParallelSearcher
+from chess_engine.position import Position
+from chess_engine.search import Searcher
+from chess_engine.tt import TranspositionTable
+
+MIDDLEGAME = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+
+
+def test_one_worker_matches_serial_search():
+    serial = Searcher(TranspositionTable(4))
+    serial.tt.new_search()
+    expected = serial.iterative_deepening(Position.from_fen(MIDDLEGAME), 3)
+    with ParallelSearcher(1, 4) as engine:
+        assert engine.search(Position.from_fen(MIDDLEGAME), 3) == expected
+        assert engine.last_nodes == serial.nodes
+
+
+def test_helpers_share_table_and_stop():
+    pos = Position.from_fen(MIDDLEGAME)
+    with ParallelSearcher(2, 4) as engine:
+        score, move, depth = engine.search(pos, 3)
+        assert depth == 3 and move is not None
+        assert engine.last_nodes > engine.last_searcher.nodes
+    assert pos.fen() == MIDDLEGAME
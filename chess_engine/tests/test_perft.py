@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.perft import SUITE, divide, perft, perft_state, run_suite
+from chess_engine.position import START_FEN, Position
+from chess_engine.rules import GameState
+
+
+def test_suite_matches_known_counts():
+    results = list(run_suite(max_nodes=20000))
+    assert len(results) == len(SUITE)
+    for name, depth, expected, nodes, _ in results:
+        assert nodes == expected, name
+
+
+def test_divide_sums_to_perft_and_apis_agree():
+    fen = SUITE[1][1]
+    counts = divide(Position.from_fen(fen), 2)
+    assert len(counts) == 48
+    assert sum(counts.values()) == perft(Position.from_fen(fen), 2) == 2039
+    assert perft_state(GameState.from_fen(START_FEN), 3) == 8902
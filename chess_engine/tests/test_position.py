@@ -0,0 +1,116 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.bitboard import EMPTY, parse_square
+from chess_engine.movegen import legal_moves
+from chess_engine.position import (
+    CAPTURE,
+    DOUBLE_PUSH,
+    EP_CAPTURE,
+    KING_CASTLE,
+    PROMOTION_CODE,
+    QUEEN_CASTLE,
+    START_FEN,
+    Position,
+    is_capture,
+    move_code,
+    move_to_uci,
+    pack_move,
+    packed_to_tuple,
+    parse_uci,
+    tuple_to_packed,
+    unpack_move,
+)
+from chess_engine.rules import GameState, apply_move, generate_moves, initial_board, result
+
+
+def test_fen_round_trip():
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    assert Position.from_fen(fen).fen() == fen
+    assert Position.initial().fen() == START_FEN
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "",
+        "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNRR w KQkq - 0 1",
+        "rnbqkbnr/pppppppp/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPX/RNBQKBNR w KQkq - 0 1",
+        "8/8/8/8 w",
+        "8/8/8/8/8/8/8/8 w - - 0 1",
+        "4k3/8/8/8/8/8/8/4KK2 w - - 0 1",
+        "4k3/8/8/8/8/8/8/4K3 x - - 0 1",
+        "4k3/8/8/8/8/8/8/4K3 w KX - 0 1",
+        "4k3/8/8/8/8/8/8/4K3 w - e4 0 1",
+        "4k3/8/8/8/8/8/8/4K3 w - - -1 1",
+        "4k3/8/8/8/8/8/8/4K3 w - - 0 one",
+    ],
+)
+def test_bad_fens_raise_value_error(fen):
+    with pytest.raises(ValueError):
+        Position.from_fen(fen)
+
+
+def test_fen_drops_castling_rights_without_their_pieces():
+    assert Position.from_fen("r3k3/8/8/8/8/8/8/4K2R w KQkq - 0 1").fen() == "r3k3/8/8/8/8/8/8/4K2R w Kq - 0 1"
+
+
+def test_board_adapter_matches_position():
+    state = GameState(initial_board())
+    assert state.board == initial_board()
+    assert state.white_to_move and state.castling == "KQkq"
+    assert len(generate_moves(state)) == 20
+    state = apply_move(state, (6, 4, 4, 4, None), make_copy=True)
+    assert state.en_passant == (5, 4)
+    assert state.board[4][4] == "wP" and not state.white_to_move
+
+
+def test_castling_and_en_passant():
+    pos = Position.from_fen("r3k2r/8/8/3pP3/8/8/8/R3K2R w KQkq d6 0 1")
+    pos.make_move(parse_uci("e5d6"))
+    assert pos.mailbox[parse_square("d5")] == EMPTY
+    pos.make_move(parse_uci("e8c8"))
+    assert pos.fen().startswith("2kr3r/")
+    assert pos.castling_string() == "KQ"
+
+
+def test_checkmate_result():
+    state = GameState.from_fen("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3")
+    assert generate_moves(state) == []
+    assert result(state) == "black"
+
+
+def test_unmake_restores_position():
+    for fen in (
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/Pp2P3/2N2Q1p/1PPBBPPP/R3K2R b KQkq a3 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    ):
+        pos = Position.from_fen(fen)
+        before = (pos.fen(), pos.pieces[:], pos.occupied[:], pos.mailbox[:])
+        for move in legal_moves(pos):
+            pos.make_move(move)
+            for reply in legal_moves(pos):
+                pos.make_move(reply)
+                pos.unmake_move()
+            pos.unmake_move()
+            assert (pos.fen(), pos.pieces, pos.occupied, pos.mailbox) == before
+        assert pos.undo_stack == []
+
+
+def test_packed_moves_carry_their_kind():
+    pos = Position.from_fen("r3k2r/1P6/8/3pP3/8/1p6/8/R3K2R w KQkq d6 0 1")
+    packed = [pack_move(pos, m) for m in legal_moves(pos)]
+    assert [unpack_move(m) for m in packed] == legal_moves(pos)
+    codes = {move_to_uci(unpack_move(m)): move_code(m) for m in packed}
+    assert codes["e5d6"] == EP_CAPTURE and codes["e1g1"] == KING_CASTLE and codes["e1c1"] == QUEEN_CASTLE
+    assert codes["b7b8q"] == PROMOTION_CODE + 3 and codes["b7a8n"] == PROMOTION_CODE | CAPTURE
+    assert codes["a1a8"] == CAPTURE and codes["e5e6"] == 0
+    assert sum(is_capture(m) for m in packed) == 7  # a8, h8, four capturing promotions, en passant
+    for m in packed:
+        assert tuple_to_packed(pos, packed_to_tuple(m)) == m
+    assert move_code(pack_move(Position.from_fen(START_FEN), parse_uci("e2e4"))) == DOUBLE_PUSH
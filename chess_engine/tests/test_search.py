@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.rules import GameState, generate_moves
+from chess_engine.position import Position
+from chess_engine.search import INFINITE, MATE_SCORE, AIPlayer, Searcher
+from chess_engine.tt import TranspositionTable
+
+MIDDLEGAME = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+
+
+def test_time_budget_returns_best_move_so_far():
+    state = GameState.from_fen(MIDDLEGAME)
+    ai = AIPlayer("hard")
+    start = time.perf_counter()
+    move = ai.choose_move(state, time_limit=0.3)
+    assert time.perf_counter() - start < 1.0
+    assert move in generate_moves(state)
+    assert ai.last_pv[0] == move
+    assert state == GameState.from_fen(MIDDLEGAME)
+
+
+def test_node_budget_and_mate_in_one():
+    state = GameState.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    ai = AIPlayer("medium", node_limit=5000)
+    assert ai.choose_move(state) == (7, 0, 0, 0, None)
+    assert ai.last_score == MATE_SCORE - 1
+
+
+def test_mate_scores_prefer_faster_mates_and_stalemate_is_a_draw():
+    searcher = Searcher(TranspositionTable(1))
+    score, move, depth = searcher.iterative_deepening(Position.from_fen("k7/8/1K6/8/8/8/8/7R w - - 0 1"), 4)
+    assert (score, depth) == (MATE_SCORE - 1, 1)
+    score, move = searcher.search(Position.from_fen("k7/8/1K6/8/8/8/8/7R b - - 0 1"), 3, -INFINITE, INFINITE, False)
+    assert score == MATE_SCORE - 2
+    stalemate = Position.from_fen("k7/8/1Q6/8/8/8/8/7K b - - 0 1")
+    assert Searcher().search(stalemate, 2, -INFINITE, INFINITE, False) == (0, None)
+
+
+def test_principal_variation_search_agrees_with_reference_on_mates():
+    for fen, expected in (
+        ("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1", MATE_SCORE - 1),
+        ("k7/8/1K6/8/8/8/8/7R b - - 0 1", MATE_SCORE - 2),
+        ("r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 4 4", MATE_SCORE - 1),
+    ):
+        for reference in (True, False):
+            searcher = Searcher(TranspositionTable(1), reference=reference)
+            score, move, _ = searcher.iterative_deepening(Position.from_fen(fen), 4)
+            assert score == expected
+
+
+def test_mate_on_the_hundredth_halfmove_is_not_a_draw():
+    # Ra8# makes the halfmove clock 100; a quiet move instead would draw.
+    for reference in (True, False):
+        searcher = Searcher(TranspositionTable(1), reference=reference)
+        score, move, _ = searcher.iterative_deepening(Position.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 99 80"), 2)
+        assert score == MATE_SCORE - 1
+
+
+def test_pruned_search_reaches_more_depth_on_the_same_node_budget():
+    depths = []
+    for reference in (True, False):
+        searcher = Searcher(TranspositionTable(4), reference=reference)
+        pos = Position.from_fen(MIDDLEGAME)
+        _, _, depth = searcher.iterative_deepening(pos, 20, node_limit=20000)
+        assert pos.fen() == MIDDLEGAME
+        depths.append(depth)
+    assert depths[1] > depths[0]
+
+
+def test_null_move_is_taken_back():
+    pos = Position.from_fen("rnbqkbnr/pppp1ppp/8/8/3Pp3/8/PPP1PPPP/RNBQKBNR b KQkq d3 0 2")
+    key = pos.key
+    pos.make_null_move()
+    assert pos.side == 0 and pos.key != key
+    pos.unmake_null_move()
+    assert pos.key == key and pos.fen() == "rnbqkbnr/pppp1ppp/8/8/3Pp3/8/PPP1PPPP/RNBQKBNR b KQkq d3 0 2"
@@ -0,0 +1,26 @@
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.position import Position, parse_uci
+from chess_engine.search import Searcher
+from chess_engine.see import see
+
+
+def test_static_exchange():
+    pos = Position.from_fen("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1")
+    assert see(pos, parse_uci("e1e5")) == 100
+    pos = Position.from_fen("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1")
+    assert see(pos, parse_uci("d3e5")) == -220
+    pos = Position.from_fen("4k3/8/2p5/3p4/8/8/3Q4/4K3 w - - 0 1")
+    assert see(pos, parse_uci("d2d5")) == -800
+
+
+def test_quiescence_avoids_poisoned_capture():
+    # At depth 1 a plain search grabs the defended pawn with the queen.
+    pos = Position.from_fen("4k3/8/2p5/3p4/8/8/3Q4/4K3 w - - 0 1")
+    _, move = Searcher(quiescence=False).search(pos, 1, -math.inf, math.inf, True)
+    assert move == parse_uci("d2d5")
+    score, move = Searcher().search(pos, 1, -math.inf, math.inf, True)
+    assert move != parse_uci("d2d5") and score > 500  # still a queen against two pawns
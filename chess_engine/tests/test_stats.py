@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.position import Position
+from chess_engine.rules import GameState
+from chess_engine.search import AIPlayer, Searcher
+from chess_engine.stats import SearchStats
+from chess_engine.tt import TranspositionTable
+
+FEN = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+
+
+def test_collector_is_filled_by_the_search():
+    searcher = Searcher(TranspositionTable(1))
+    searcher.stats = SearchStats()
+    _, _, depth = searcher.iterative_deepening(Position.from_fen(FEN), 3)
+    stats = searcher.stats
+    assert stats.depth == depth == 3
+    assert stats.nodes == searcher.nodes and stats.qnodes == searcher.qnodes
+    assert len(stats.depth_times) == len(stats.depth_nodes) == 3
+    assert 0 < stats.tt_hits <= stats.tt_probes and stats.tt_cutoffs <= stats.tt_hits
+    assert stats.first_move_cutoffs <= stats.cutoffs and stats.nps > 0
+    assert json.loads(stats.to_json())["tt_hit_rate"] == stats.tt_hit_rate
+
+
+def test_search_without_collector_counts_nothing():
+    searcher = Searcher(TranspositionTable(1))
+    searcher.iterative_deepening(Position.from_fen(FEN), 2)
+    assert searcher.stats is None and len(searcher.depth_times) == 2
+
+
+def test_ai_player_dumps_one_json_line_per_move(tmp_path):
+    path = str(tmp_path / "stats.jsonl")
+    ai = AIPlayer("medium", stats_path=path)
+    state = GameState.from_fen(FEN)
+    ai.choose_move(state)
+    ai.choose_move(state)
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2
+    assert records[0]["fen"] == FEN and records[0]["depth"] == 2
+    assert ai.last_stats["tt_probes"] == ai.last_search_stats.tt_probes
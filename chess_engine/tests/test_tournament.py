@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.tournament import PlayerConfig, elo_difference, random_opening, run_match
+
+
+def test_elo_difference_and_config_parsing():
+    assert elo_difference(0.5, 10, 0.0) == (0.0, 0.0, 0.0)
+    elo, low, high = elo_difference(0.75, 100, 0.1875)
+    assert round(elo, 1) == 190.8 and low < elo < high
+    config = PlayerConfig.parse("difficulty=medium,time_limit=0.5,node_limit=100")
+    assert (config.difficulty, config.time_limit, config.node_limit) == ("medium", 0.5, 100)
+    assert random_opening(3, 4) == random_opening(3, 4)
+
+
+def test_match_between_two_configurations_is_headless():
+    report = run_match(PlayerConfig("medium"), PlayerConfig("easy"), 2, processes=1, max_plies=20)
+    assert report.games == 2 and report.wins + report.draws + report.losses == 2
+    assert report.a.moves > 0 and report.a.nodes > 0 and report.b.nodes == 0
+    assert "Elo" in report.summary()
+    assert "pygame" not in sys.modules
@@ -0,0 +1,31 @@
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.rules import GameState
+from chess_engine.search import minimax
+from chess_engine.tt import EXACT, LOWER, TranspositionTable
+
+
+def test_store_probe_and_replacement():
+    tt = TranspositionTable(1)
+    assert tt.size_mb == 1
+    key = 0x1234_5678_9ABC_DEF0
+    tt.store(key, 3, EXACT, -250, 1234)
+    assert tt.probe(key) == (3, EXACT, -250, 1234)
+    assert tt.probe(key ^ (1 << 63)) is None
+    tt.store(key, 1, LOWER, 40, None)  # shallower result from the same search is ignored
+    assert tt.probe(key)[0] == 3
+    tt.new_search()
+    tt.store(key, 1, LOWER, 99_995, None)  # stale entries are always replaced
+    assert tt.probe(key) == (1, LOWER, 99_995, None)
+
+
+def test_search_with_table_matches_plain_search():
+    state = GameState.from_fen("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10")
+    plain, _ = minimax(state, 2, -math.inf, math.inf, True)
+    tt = TranspositionTable(4)
+    with_tt, move = minimax(state, 2, -math.inf, math.inf, True, tt)
+    assert plain == with_tt
+    assert tt.probe(state.position.key)[3] is not None and move is not None
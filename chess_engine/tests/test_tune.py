@@ -0,0 +1,73 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine import pst
+from chess_engine.batch import encode, evaluate_batch
+from chess_engine.evaluate import evaluate_position
+from chess_engine.position import START_FEN, Position
+from chess_engine.tune import Features, current_values, parse_line, read_chunks, save, tune
+
+# White is a rook up in the first two positions and wins; black in the rest.
+LINES = [
+    '4k3/pppp4/8/8/8/8/PPPP4/R3K3 w - - 0 1 c9 "1-0";',
+    "4k3/8/8/8/8/8/8/R3K3 b - - 0 1 [1.0]",
+    "r3k3/8/8/8/8/8/8/4K3 w - - 0 1 0-1",
+    "r3k3/pppp4/8/8/8/8/PPPP4/4K3 b - - 0 1 [0.0]",
+    "not a position",
+]
+
+
+def parse(line):
+    codes = np.empty(64, dtype=np.int8)
+    result = parse_line(line, codes)
+    return None if result is None else (codes.tolist(), result)
+
+
+def test_parse_line_formats():
+    parsed = [parse(line) for line in LINES]
+    assert [p[1] for p in parsed[:4]] == [1.0, 1.0, 0.0, 0.0] and parsed[4] is None
+    assert parsed[1][0][60] == 5 and parsed[1][0][56] == 3 and parsed[1][0][0] == -1
+    assert parse(START_FEN + " 1/2-1/2")[1] == 0.5
+
+
+def test_parse_line_skips_unlabelled_fens():
+    # The fullmove number at the end of a FEN is not a result.
+    assert parse("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1") is None
+    assert parse("4k3/8/8/8/8/8/8/R3K3 w - - 0 10") is None
+    assert parse("4k3/8/8/8/8/8/8/R3K3 w - - 0 1 1") is None
+
+
+def test_features_match_the_engine_evaluation(tmp_path):
+    path = tmp_path / "positions.epd"
+    path.write_text("\n".join(LINES) + "\n")
+    chunks = list(read_chunks([str(path)], chunk_size=3))
+    assert [len(c[0]) for c in chunks] == [3, 1]
+    features = Features(*chunks[0])
+    mg, eg = current_values()
+    expected = [evaluate_position(Position.from_fen(line.split(" ", 1)[0] + " w - - 0 1")) for line in LINES[:3]]
+    assert np.allclose(features.evaluate(mg, eg), expected, atol=1)
+
+
+def test_tuned_tables_lower_the_error_and_load(tmp_path):
+    codes = encode([line.split(" ", 1)[0] + " w - - 0 1" for line in LINES[:4]])
+    # Labels that disagree with the tables: the side a rook down wins.
+    features = Features(codes, np.array([0.0, 0.0, 1.0, 1.0], dtype=np.float32))
+    mg, eg, errors = tune([features], epochs=50, batch_size=2, lr=20, k=0.005)
+    assert errors[-1] < errors[0]
+    path = str(tmp_path / "tables.json")
+    save(path, mg, eg)
+    pos_fen = "4k3/8/8/8/8/8/8/R3K3 w - - 0 1"
+    before = evaluate_position(Position.from_fen(pos_fen))
+    try:
+        pst.load_tables(path)
+        after = evaluate_position(Position.from_fen(pos_fen))
+        assert after < before
+        assert evaluate_batch(encode([pos_fen]))[0] == after
+    finally:
+        pst.reset_tables()
+    assert evaluate_position(Position.from_fen(pos_fen)) == before
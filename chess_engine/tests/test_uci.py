@@ -0,0 +1,71 @@
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.bitboard import BLACK, WHITE
+from chess_engine.search import MATE_SCORE
+from chess_engine.uci import UCIEngine, main, uci_score
+
+
+def run(*commands):
+    out = io.StringIO()
+    main(io.StringIO("\n".join(commands) + "\n"), out)
+    return out.getvalue().splitlines()
+
+
+def test_handshake_depth_search_and_info_lines():
+    lines = run("uci", "isready", "position startpos moves e2e4 e7e5", "go depth 2")
+    assert lines[:2] == ["id name PythonArcade Chess", "id author PythonArcade"]
+    assert "uciok" in lines and "readyok" in lines
+    info = [line for line in lines if line.startswith("info depth")]
+    assert [line.split()[2] for line in info] == ["1", "2"]
+    for field in ("score cp", "nodes", "nps", "pv"):
+        assert field in info[-1]
+    assert lines[-1].startswith("bestmove ") and lines[-1].split()[1] == info[-1].split(" pv ")[1].split()[0]
+
+
+def test_mate_nodes_and_stop():
+    lines = run("position fen 6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1", "go nodes 2000")
+    assert "score mate 1" in lines[-2] and lines[-1] == "bestmove a1a8"
+
+    out = io.StringIO()
+    engine = UCIEngine(out)
+    engine.handle("position startpos")
+    engine.handle("go infinite")
+    time.sleep(0.2)
+    assert "bestmove" not in out.getvalue()
+    engine.handle("stop")
+    assert out.getvalue().splitlines()[-1].startswith("bestmove ")
+
+
+def test_score_is_from_side_to_move():
+    assert uci_score(35, WHITE) == "cp 35" and uci_score(35, BLACK) == "cp -35"
+    assert uci_score(MATE_SCORE - 3, WHITE) == "mate 2"
+    assert uci_score(MATE_SCORE - 3, BLACK) == "mate -2"
+
+
+def test_bad_moves_and_options_are_ignored():
+    engine = UCIEngine(io.StringIO())
+    engine.handle("position startpos moves e2e4 e7e5 e4e5 g1f3")
+    assert engine.position.fen() == "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2"
+    engine.handle("position startpos moves d2d4 0000 d7d5")
+    assert engine.position.fen() == "rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq d3 0 1"
+    tt = engine.tt
+    engine.handle("setoption name Hash value lots")
+    assert engine.tt is tt
+    engine.handle("setoption name Hash value 1")
+    assert engine.tt is not tt
+
+
+def test_bad_go_parameters_and_fens_are_ignored():
+    lines = run("position startpos", "go depth x nodes 500", "isready")
+    assert "readyok" in lines and any(line.startswith("bestmove ") for line in lines)
+
+    engine = UCIEngine(io.StringIO())
+    engine.handle("position startpos moves e2e4")
+    fen = engine.position.fen()
+    engine.handle("position fen rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    engine.handle("position fen 8/8/8/8 w moves e2e4")
+    assert engine.position.fen() == fen
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from chess_engine.rules import GameState, apply_move, generate_moves
+from chess_engine.search import AIPlayer
+from chess_engine.worker import SearchWorker
+
+MIDDLEGAME = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+
+
+def wait_for_move(worker, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        move = worker.poll()
+        if move is not None:
+            return move
+        time.sleep(0.01)
+    return None
+
+
+def test_background_search_and_cancel():
+    state = GameState.from_fen(MIDDLEGAME)
+    worker = SearchWorker(AIPlayer("hard", time_limit=0.2))
+    worker.start(state)
+    assert worker.thinking
+    move = wait_for_move(worker)
+    assert move in generate_moves(state)
+    assert not worker.thinking
+
+    worker.ai.time_limit = 30
+    worker.start(state)
+    start = time.perf_counter()
+    worker.cancel()
+    assert time.perf_counter() - start < 1.0
+    assert not worker.thinking and worker.poll() is None
+
+
+def test_ponder_warms_table_for_expected_reply():
+    state = GameState.from_fen(MIDDLEGAME)
+    ai = AIPlayer("hard", time_limit=0.3)
+    worker = SearchWorker(ai, ponder=True)
+    worker.start(state)
+    state = apply_move(state, wait_for_move(worker))
+    reply = ai.last_pv[1]
+    worker.start_ponder(state)
+    assert worker.pondering and not worker.thinking
+    time.sleep(0.3)
+    worker.cancel()
+    assert not worker.pondering
+    after = apply_move(state, reply, make_copy=True)
+    assert ai.tt.probe(after.position.key) is not None
@@ -0,0 +1,258 @@
+"""Headless AI-vs-AI matches.
+
+Plays a number of games between two :class:`AIPlayer` configurations on a
+process pool and reports the score, the Elo difference with a 95%
+confidence interval, and the speed of each side.  Every opening is played
+twice with colours reversed; openings start with a few random moves from a
+seeded generator so that runs are repeatable.  Nothing here imports
+pygame.
+
+Example::
+
+    python -m chess_engine.tournament --games 40 --a difficulty=hard,time_limit=0.2 \\
+        --b difficulty=hard,node_limit=5000
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from .bitboard import WHITE
+from .movegen import legal_moves
+from .position import Position, move_to_uci
+from .rules import GameState, apply_move, position_result
+from .search import AIPlayer
+
+
+@dataclass
+class PlayerConfig:
+    difficulty: str = "hard"
+    time_limit: Optional[float] = None
+    node_limit: Optional[int] = None
+    hash_mb: float = 16
+    book: Optional[str] = None
+    reference: bool = False  # plain minimax instead of principal variation search
+
+    @classmethod
+    def parse(cls, text: str) -> "PlayerConfig":
+        """Parse ``key=value,...``, e.g. ``difficulty=hard,time_limit=0.5``."""
+        config = cls()
+        for item in filter(None, text.split(",")):
+            key, value = item.split("=", 1)
+            if key not in cls.__dataclass_fields__:
+                raise ValueError(f"unknown player option {key!r}")
+            if key in ("time_limit", "hash_mb"):
+                setattr(config, key, float(value))
+            elif key == "node_limit":
+                setattr(config, key, int(value))
+            elif key == "reference":
+                setattr(config, key, value.lower() in ("1", "true", "yes"))
+            else:
+                setattr(config, key, value)
+        return config
+
+    def create(self) -> AIPlayer:
+        return AIPlayer(
+            self.difficulty, self.hash_mb, self.time_limit, self.node_limit, book=self.book, reference=self.reference
+        )
+
+
+@dataclass
+class SideStats:
+    moves: int = 0
+    nodes: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: "SideStats"):
+        self.moves += other.moves
+        self.nodes += other.nodes
+        self.seconds += other.seconds
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def time_per_move(self) -> float:
+        return self.seconds / self.moves if self.moves else 0.0
+
+
+@dataclass
+class GameResult:
+    score: float  # for player A: 1 win, 0.5 draw, 0 loss
+    a_white: bool
+    plies: int
+    reason: str
+    moves: List[str] = field(default_factory=list)
+    a: SideStats = field(default_factory=SideStats)
+    b: SideStats = field(default_factory=SideStats)
+
+
+def random_opening(seed: int, plies: int) -> List[int]:
+    """Random legal moves from the start position, repeatable by seed."""
+    rng = random.Random(seed)
+    pos = Position.initial()
+    moves = []
+    for _ in range(plies):
+        choices = legal_moves(pos)
+        if not choices:
+            break
+        move = rng.choice(choices)
+        pos.make_move(move)
+        moves.append(move)
+    return moves
+
+
+def play_game(a: PlayerConfig, b: PlayerConfig, a_white: bool, opening: List[int], max_plies: int = 300) -> GameResult:
+    players = {True: a.create(), False: b.create()}  # keyed by "is player A"
+    stats = {True: SideStats(), False: SideStats()}
+    state = GameState()
+    for move in opening:
+        state.position.make_move(move)
+    seen: Dict[int, int] = {state.position.key: 1}
+    winner = None
+    reason = "max plies"
+    for _ in range(max_plies):
+        res = position_result(state.position)
+        if res is not None:
+            winner = res
+            if res != "draw":
+                reason = "checkmate"
+            else:
+                reason = "fifty moves" if state.legal_moves() else "stalemate"
+            break
+        is_a = (state.position.side == WHITE) == a_white
+        player = players[is_a]
+        start = time.perf_counter()
+        move = player.choose_move(state)
+        side = stats[is_a]
+        side.seconds += time.perf_counter() - start
+        side.moves += 1
+        side.nodes += player.last_stats.get("total_nodes", 0)
+        apply_move(state, move)
+        key = state.position.key
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] >= 3:
+            winner, reason = "draw", "repetition"
+            break
+    for player in players.values():
+        player.close()
+    if winner in ("white", "black"):
+        score = 1.0 if (winner == "white") == a_white else 0.0
+    else:
+        score = 0.5
+    history = [move_to_uci(m[0]) for m in state.position.undo_stack]
+    return GameResult(score, a_white, len(history), reason, history, stats[True], stats[False])
+
+
+def _play(job: Tuple[PlayerConfig, PlayerConfig, bool, List[int], int]) -> GameResult:
+    return play_game(*job)
+
+
+def elo_difference(score: float, games: int, variance: float) -> Tuple[float, float, float]:
+    """Elo difference for a mean ``score`` with its 95% confidence interval.
+
+    ``variance`` is the per-game variance of the score.  Returns
+    ``(elo, low, high)``; scores of 0 or 1 give infinite values.
+    """
+
+    def elo(s: float) -> float:
+        if s <= 0:
+            return -math.inf
+        if s >= 1:
+            return math.inf
+        return -400 * math.log10(1 / s - 1)
+
+    margin = 1.96 * math.sqrt(variance / games) if games else 0.0
+    return elo(score), elo(score - margin), elo(score + margin)
+
+
+@dataclass
+class MatchReport:
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    a: SideStats = field(default_factory=SideStats)
+    b: SideStats = field(default_factory=SideStats)
+    scores: List[float] = field(default_factory=list)
+
+    def add(self, game: GameResult):
+        self.scores.append(game.score)
+        if game.score == 1:
+            self.wins += 1
+        elif game.score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        self.a.add(game.a)
+        self.b.add(game.b)
+
+    @property
+    def games(self) -> int:
+        return len(self.scores)
+
+    def elo(self) -> Tuple[float, float, float]:
+        n = self.games
+        mean = sum(self.scores) / n if n else 0.5
+        variance = sum((s - mean) ** 2 for s in self.scores) / n if n else 0.0
+        return elo_difference(mean, n, variance)
+
+    def summary(self) -> str:
+        elo, low, high = self.elo()
+        lines = [
+            f"games {self.games}: A wins {self.wins}, draws {self.draws}, losses {self.losses}",
+            f"Elo A - B: {elo:+.1f} (95% CI {low:+.1f} to {high:+.1f})",
+        ]
+        for name, side in (("A", self.a), ("B", self.b)):
+            lines.append(f"{name}: {side.nps:.0f} nodes/s, {side.time_per_move * 1000:.1f} ms/move over {side.moves} moves")
+        return "\n".join(lines)
+
+
+def run_match(
+    a: PlayerConfig,
+    b: PlayerConfig,
+    games: int,
+    processes: Optional[int] = None,
+    opening_plies: int = 4,
+    seed: int = 0,
+    max_plies: int = 300,
+) -> MatchReport:
+    """Play ``games`` games, alternating colours over shared openings."""
+    jobs = []
+    for i in range(games):
+        opening = random_opening(seed + i // 2, opening_plies)
+        jobs.append((a, b, i % 2 == 0, opening, max_plies))
+    report = MatchReport()
+    if processes == 1:
+        for game in map(_play, jobs):
+            report.add(game)
+        return report
+    with Pool(processes) as pool:
+        for game in pool.imap_unordered(_play, jobs):
+            report.add(game)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Play AIPlayer configurations against each other.")
+    parser.add_argument("--a", type=PlayerConfig.parse, default=PlayerConfig(), help="player A, key=value,...")
+    parser.add_argument("--b", type=PlayerConfig.parse, default=PlayerConfig(), help="player B, key=value,...")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--opening-plies", type=int, default=4, help="random moves played before the engines")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-plies", type=int, default=300, help="adjudicate a draw after this many plies")
+    args = parser.parse_args(argv)
+    print("A:", asdict(args.a))
+    print("B:", asdict(args.b))
+    report = run_match(args.a, args.b, args.games, args.processes, args.opening_plies, args.seed, args.max_plies)
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Train the NNUE evaluator from self-play, on the CPU with NumPy.
+
+The engine plays games against itself from random openings on a process
+pool.  Every position where the side to move is not in check and the
+chosen move is not a capture is kept with the search score and the final
+result of the game.  The network is then fitted by mini-batch Adam so that
+``sigmoid(eval)`` matches a blend of ``sigmoid(search score)`` and the
+result, and saved quantised for :class:`chess_engine.nnue.Network`.
+
+Example::
+
+    python -m chess_engine.train_nnue --games 200 --nodes 3000 --data selfplay.npz --out chess_nnue.npz
+
+``--data`` keeps the generated positions so that later runs can train on
+them again without replaying; ``--init`` continues from an existing network
+(which also plays the games when given).
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import time
+from multiprocessing import Pool
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .batch import to_planes
+from .movegen import in_check
+from .nnue import EVAL_SCALE, FT_SCALE, INPUTS, OUT_SCALE, Network
+from .rules import GameState, apply_move, position_result
+from .search import MATE_BOUND, AIPlayer
+from .tournament import random_opening
+
+# Scores are mapped to expected results by sigmoid(score * K), 400 cp = 10:1 odds.
+K = math.log(10) / 400
+
+
+def play_game(seed: int, node_limit: int, opening_plies: int = 6, max_plies: int = 200, nnue: Optional[str] = None):
+    """One self-play game as ``(codes, scores, result)`` for its quiet positions."""
+    ai = AIPlayer("hard", node_limit=node_limit, nnue=nnue)
+    state = GameState()
+    for move in random_opening(seed, opening_plies):
+        state.position.make_move(move)
+    codes: List[List[int]] = []
+    scores: List[int] = []
+    seen = {state.position.key: 1}
+    outcome = "draw"
+    for _ in range(max_plies):
+        res = position_result(state.position)
+        if res is not None:
+            outcome = res
+            break
+        pos = state.position
+        move = ai.choose_move(state)
+        target = move[2] * 8 + move[3]
+        if not in_check(pos, pos.side) and pos.mailbox[target] < 0 and abs(ai.last_score) < MATE_BOUND:
+            codes.append(pos.mailbox[:])
+            scores.append(ai.last_score)
+        apply_move(state, move)
+        seen[pos.key] = seen.get(pos.key, 0) + 1
+        if seen[pos.key] >= 3:
+            break
+    ai.close()
+    result = {"white": 1.0, "black": 0.0}.get(outcome, 0.5)
+    return codes, scores, result
+
+
+def _play(job):
+    return play_game(*job)
+
+
+def self_play(
+    games: int,
+    node_limit: int,
+    processes: Optional[int] = None,
+    seed: int = 0,
+    opening_plies: int = 6,
+    max_plies: int = 200,
+    nnue: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(codes (N, 64) int8, scores (N,) int32, results (N,) float32)`` from self-play."""
+    jobs = [(seed + i, node_limit, opening_plies, max_plies, nnue) for i in range(games)]
+    codes: List[List[int]] = []
+    scores: List[int] = []
+    results: List[float] = []
+    if processes == 1:
+        played = map(_play, jobs)
+    else:
+        pool = Pool(processes)
+        played = pool.imap_unordered(_play, jobs)
+    for game_codes, game_scores, result in played:
+        codes.extend(game_codes)
+        scores.extend(game_scores)
+        results.extend([result] * len(game_scores))
+    if processes != 1:
+        pool.close()
+        pool.join()
+    return (
+        np.array(codes, dtype=np.int8).reshape(-1, 64),
+        np.array(scores, dtype=np.int32),
+        np.array(results, dtype=np.float32),
+    )
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+def train(
+    codes: np.ndarray,
+    scores: np.ndarray,
+    results: np.ndarray,
+    hidden: int = 64,
+    epochs: int = 20,
+    batch_size: int = 256,
+    lr: float = 1e-3,
+    lam: float = 0.5,
+    seed: int = 0,
+    init: Optional[Network] = None,
+    log=None,
+) -> Tuple[Network, List[float]]:
+    """Fit a network and return it quantised, with the mean loss of every epoch.
+
+    ``lam`` weights the search score against the game result in the target.
+    """
+    rng = np.random.default_rng(seed)
+    if init is None:
+        init = Network.random(hidden, seed)
+    params = [np.array(p, dtype=np.float64) for p in init.to_float()]
+    moments = [np.zeros_like(p) for p in params]
+    squares = [np.zeros_like(p) for p in params]
+    limits = (32767 / FT_SCALE, 32767 / FT_SCALE, 32767 / OUT_SCALE, None)
+    targets = lam * _sigmoid(scores * K) + (1 - lam) * results
+    scale = EVAL_SCALE * K
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    losses = []
+    for epoch in range(epochs):
+        order = rng.permutation(len(codes))
+        total = 0.0
+        for start in range(0, len(order), batch_size):
+            index = order[start : start + batch_size]
+            x = to_planes(codes[index]).reshape(len(index), INPUTS).astype(np.float64)
+            target = targets[index]
+            w1, b1, w2, b2 = params
+            h = x @ w1 + b1
+            active = np.clip(h, 0, 1)
+            p = _sigmoid((active @ w2 + b2) * scale)
+            error = p - target
+            total += float((error**2).sum())
+            g = 2 * error * p * (1 - p) * scale / len(index)
+            dh = np.outer(g, w2) * ((h > 0) & (h < 1))
+            grads = (x.T @ dh, dh.sum(axis=0), active.T @ g, g.sum())
+            step += 1
+            for i, grad in enumerate(grads):
+                moments[i] = beta1 * moments[i] + (1 - beta1) * grad
+                squares[i] = beta2 * squares[i] + (1 - beta2) * grad * grad
+                update = lr * (moments[i] / (1 - beta1**step)) / (np.sqrt(squares[i] / (1 - beta2**step)) + eps)
+                params[i] = params[i] - update
+                if limits[i] is not None:
+                    params[i] = np.clip(params[i], -limits[i], limits[i])
+        losses.append(total / len(codes))
+        if log is not None:
+            log(f"epoch {epoch + 1}: loss {losses[-1]:.5f}")
+    return Network.from_float(*params), losses
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Train the NNUE evaluator from self-play.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--nodes", type=int, default=2000, help="search node budget per move")
+    parser.add_argument("--processes", type=int, default=None, help="self-play processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", help="positions file (.npz): loaded if it exists, written otherwise")
+    parser.add_argument("--init", help="network to start from and to play the games with")
+    parser.add_argument("--hidden", type=int, default=64)
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--lam", type=float, default=0.5, help="weight of the search score against the result")
+    parser.add_argument("--out", default="chess_nnue.npz")
+    args = parser.parse_args(argv)
+
+    if args.data and os.path.exists(args.data):
+        with np.load(args.data) as data:
+            codes, scores, results = data["codes"], data["scores"], data["results"]
+    else:
+        start = time.perf_counter()
+        codes, scores, results = self_play(args.games, args.nodes, args.processes, args.seed, nnue=args.init)
+        print(f"{len(codes)} positions from {args.games} games in {time.perf_counter() - start:.1f}s")
+        if args.data:
+            np.savez_compressed(args.data, codes=codes, scores=scores, results=results)
+    init = Network.load(args.init) if args.init else None
+    network, _ = train(
+        codes, scores, results, args.hidden, args.epochs, args.batch_size, args.lr, args.lam, args.seed, init, print
+    )
+    network.save(args.out)
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Fixed-size transposition table.
+
+Entries live in one preallocated buffer viewed as two arrays of unsigned
+64-bit words, one for keys and one for packed data, so the memory used is
+exactly the configured budget and does not grow during search.  The
+buffer may be shared memory, in which case several processes read and
+write the same table without locks: each slot stores ``key ^ data``, so
+an entry torn by concurrent writers simply fails to match on probe.
+Each entry packs::
+
+    bits  0-15  best move (0 when unknown)
+    bits 16-23  search depth
+    bits 24-25  bound type
+    bits 26-31  search generation
+    bits 32-63  score, offset by 2**31
+
+Replacement is depth-preferred with ageing: a slot is overwritten when it
+is empty, holds an entry from an earlier search, or the new entry was
+searched at least as deep.
+"""
+from __future__ import annotations
+
+import multiprocessing
+from typing import Optional, Tuple
+
+EXACT, LOWER, UPPER = 1, 2, 3
+
+ENTRY_BYTES = 16
+
+# Scores are clamped to this magnitude before they are packed.
+SCORE_LIMIT = 1_000_000
+_SCORE_OFFSET = 1 << 31
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: float = 16, shared: bool = False):
+        entries = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        # Round down to a power of two so the index is a mask.
+        self.size = 1 << (entries.bit_length() - 1)
+        if shared:
+            self.buffer = multiprocessing.RawArray("B", self.size * ENTRY_BYTES)
+        else:
+            self.buffer = bytearray(self.size * ENTRY_BYTES)
+        self.generation = 0
+        self._attach()
+
+    @classmethod
+    def from_buffer(cls, buffer, generation: int = 0) -> "TranspositionTable":
+        """Use a buffer created by another table, e.g. in a helper process."""
+        tt = cls.__new__(cls)
+        tt.size = len(buffer) // ENTRY_BYTES
+        tt.buffer = buffer
+        tt.generation = generation
+        tt._attach()
+        return tt
+
+    def _attach(self):
+        self.mask = self.size - 1
+        words = memoryview(self.buffer).cast("B").cast("Q")
+        self.keys = words[: self.size]
+        self.data = words[self.size :]
+
+    @property
+    def size_mb(self) -> float:
+        return self.size * ENTRY_BYTES / (1024 * 1024)
+
+    def clear(self):
+        memoryview(self.buffer).cast("B")[:] = bytes(self.size * ENTRY_BYTES)
+        self.generation = 0
+
+    def new_search(self):
+        """Age existing entries so they are replaced before fresh ones."""
+        self.generation = (self.generation + 1) & 63
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, Optional[int]]]:
+        """Return ``(depth, bound, score, move)`` for ``key`` or None."""
+        index = key & self.mask
+        data = self.data[index]
+        if not data or self.keys[index] ^ data != key:
+            return None
+        move = data & 0xFFFF
+        return (data >> 16) & 0xFF, (data >> 24) & 3, (data >> 32) - _SCORE_OFFSET, move or None
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: Optional[int]):
+        index = key & self.mask
+        old = self.data[index]
+        if old and (old >> 26) & 63 == self.generation and depth < (old >> 16) & 0xFF:
+            return
+        if score >= SCORE_LIMIT:
+            score = SCORE_LIMIT
+        elif score <= -SCORE_LIMIT:
+            score = -SCORE_LIMIT
+        data = (
+            (move or 0)
+            | (min(depth, 255) << 16)
+            | (bound << 24)
+            | (self.generation << 26)
+            | ((int(score) + _SCORE_OFFSET) << 32)
+        )
+        self.keys[index] = key ^ data
+        self.data[index] = data
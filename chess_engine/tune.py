@@ -0,0 +1,275 @@
+"""Texel tuning of the piece-square tables (requires NumPy).
+
+Input files hold one labelled position per line: a FEN (only the board
+field is used) followed by the game result as ``1-0``, ``0-1`` or
+``1/2-1/2`` (optionally quoted, e.g. ``c9 "1-0";``) or as a white score in
+brackets, e.g. ``[0.5]``.  A bare number is not a label, since it cannot be
+told apart from the fullmove number of an unlabelled FEN.  Positions are
+read in chunks straight into preallocated arrays, 64 one-byte piece codes
+plus a phase and a result per position, so millions of positions fit in
+memory.
+
+The tuned values are the midgame and endgame score of every piece type on
+every square, material included, exactly as :mod:`chess_engine.pst` uses
+them.  The evaluation is linear in those values, so the gradient of the
+mean squared error between ``sigmoid(K * eval)`` and the result is a
+scatter-add over the pieces of each batch.  Steps are taken with Adam,
+starting from the current tables.  The result is written with
+:func:`chess_engine.pst.save_tables`, split back into material values and
+tables::
+
+    python -m chess_engine.tune positions.epd --out chess_eval.json
+
+``chess.py`` loads ``chess_eval.json`` at startup; other front ends load
+the file named by the ``CHESS_EVAL_TABLES`` environment variable.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from . import pst
+from .bitboard import FEN_SYMBOLS
+
+_RESULT = re.compile(r'"?(1-0|0-1|1/2-1/2)"?;?\s*$|\[\s*([01](?:\.\d+)?)\s*\];?\s*$')
+_FEN_CODES = {symbol: code for code, symbol in enumerate(FEN_SYMBOLS)}
+_RESULT_VALUES = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+_PHASES = np.array(pst.PIECE_PHASES + [0], dtype=np.int16)
+
+
+def parse_line(line: str, codes: np.ndarray) -> Optional[float]:
+    """Write the piece codes of a labelled line into ``codes`` (64 entries) and return its white score.
+
+    Returns None, leaving ``codes`` undefined, if the line has no result or
+    no valid board.
+    """
+    match = _RESULT.search(line)
+    if match is None:
+        return None
+    result = _RESULT_VALUES[match.group(1)] if match.group(1) else float(match.group(2))
+    codes[:] = -1
+    sq = 0
+    for char in line.split(None, 1)[0]:
+        if char == "/":
+            continue
+        if char.isdigit():
+            sq += int(char)
+        elif char in _FEN_CODES and sq < 64:
+            codes[sq] = _FEN_CODES[char]
+            sq += 1
+        else:
+            return None
+    if sq != 64:
+        return None
+    return result
+
+
+def read_chunks(paths: Iterable[str], chunk_size: int = 1_000_000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield ``(codes (n, 64) int8, results (n,) float32)`` for up to ``chunk_size`` positions at a time.
+
+    Lines are parsed into one preallocated buffer, and each chunk is a copy
+    of its filled rows.
+    """
+    codes = np.empty((chunk_size, 64), dtype=np.int8)
+    results = np.empty(chunk_size, dtype=np.float32)
+    n = 0
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                result = parse_line(line, codes[n])
+                if result is None:
+                    continue
+                results[n] = result
+                n += 1
+                if n == chunk_size:
+                    yield codes.copy(), results.copy()
+                    n = 0
+    if n:
+        yield codes[:n].copy(), results[:n].copy()
+
+
+class Features:
+    """One chunk of positions: piece codes, phase and result.
+
+    :meth:`sparse` turns a batch of rows into, for every square,
+    ``type * 64 + square`` seen from the piece's own side and a sign of +1
+    for white, -1 for black and 0 for an empty square.  It is computed per
+    batch so that a chunk only keeps its 64 codes per position.
+    """
+
+    def __init__(self, codes: np.ndarray, results: np.ndarray):
+        self.codes = codes
+        occupied = codes >= 0
+        phase = _PHASES[np.where(occupied, codes, 12)].sum(axis=1)
+        self.phase = (np.minimum(phase, pst.MAX_PHASE) / pst.MAX_PHASE).astype(np.float32)
+        self.results = results
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def sparse(self, rows) -> Tuple[np.ndarray, np.ndarray]:
+        codes = self.codes[rows].astype(np.intp)
+        occupied = codes >= 0
+        black = codes >= 6
+        squares = np.arange(64)
+        index = np.where(occupied, (codes % 6) * 64 + np.where(black, squares ^ 56, squares), 0)
+        sign = np.where(occupied, np.where(black, -1.0, 1.0), 0.0)
+        return index, sign
+
+    def evaluate(self, mg: np.ndarray, eg: np.ndarray, rows=slice(None)) -> np.ndarray:
+        index, sign = self.sparse(rows)
+        phase = self.phase[rows]
+        return phase * (mg[index] * sign).sum(axis=1) + (1 - phase) * (eg[index] * sign).sum(axis=1)
+
+    def gradient(self, mg: np.ndarray, eg: np.ndarray, k: float, rows):
+        """``(error sum, d/d mg, d/d eg)`` of the squared error over ``rows``."""
+        index, sign = self.sparse(rows)
+        phase = self.phase[rows]
+        p = sigmoid(k * (phase * (mg[index] * sign).sum(axis=1) + (1 - phase) * (eg[index] * sign).sum(axis=1)))
+        error = p - self.results[rows]
+        g = 2 * error * p * (1 - p) * k
+        weights = sign * g[:, None]
+        flat = index.ravel()
+        d_mg = np.bincount(flat, (weights * phase[:, None]).ravel(), minlength=6 * 64)
+        d_eg = np.bincount(flat, (weights * (1 - phase)[:, None]).ravel(), minlength=6 * 64)
+        return float((error * error).sum()), d_mg, d_eg
+
+
+def sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+def current_values() -> Tuple[np.ndarray, np.ndarray]:
+    """``(mg, eg)`` arrays of type * 64 + square values, material included."""
+    mg = np.array([[pst.MG_VALUES[t] + v for v in pst.MG_TABLES[t]] for t in range(6)], dtype=np.float64)
+    eg = np.array([[pst.EG_VALUES[t] + v for v in pst.EG_TABLES[t]] for t in range(6)], dtype=np.float64)
+    return mg.ravel(), eg.ravel()
+
+
+def error(chunks: List[Features], mg: np.ndarray, eg: np.ndarray, k: float, batch_size: int = 65536) -> float:
+    """Mean squared error of ``sigmoid(k * eval)`` against the results."""
+    total = 0.0
+    for f in chunks:
+        for start in range(0, len(f), batch_size):
+            rows = slice(start, start + batch_size)
+            total += float(((sigmoid(k * f.evaluate(mg, eg, rows)) - f.results[rows]) ** 2).sum())
+    return total / sum(len(f) for f in chunks)
+
+
+def fit_k(chunks: List[Features], mg: np.ndarray, eg: np.ndarray) -> float:
+    """The sigmoid scale that best fits the current values, by golden-section search."""
+    low, high = math.log(10) / 1600, math.log(10) / 100
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(30):
+        a = high - ratio * (high - low)
+        b = low + ratio * (high - low)
+        if error(chunks, mg, eg, a) < error(chunks, mg, eg, b):
+            high = b
+        else:
+            low = a
+    return (low + high) / 2
+
+
+def tune(
+    chunks: List[Features],
+    epochs: int = 10,
+    batch_size: int = 16384,
+    lr: float = 1.0,
+    k: Optional[float] = None,
+    seed: int = 0,
+    log=None,
+) -> Tuple[np.ndarray, np.ndarray, List[float]]:
+    """Minimise the error from the current tables; return ``(mg, eg, error per epoch)``."""
+    rng = np.random.default_rng(seed)
+    mg, eg = current_values()
+    if k is None:
+        k = fit_k(chunks, mg, eg)
+        if log is not None:
+            log(f"K = {k:.6f}")
+    params = [mg, eg]
+    moments = [np.zeros_like(mg), np.zeros_like(eg)]
+    squares = [np.zeros_like(mg), np.zeros_like(eg)]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    errors = []
+    for epoch in range(epochs):
+        total = 0.0
+        count = 0
+        for features in chunks:
+            order = rng.permutation(len(features))
+            for start in range(0, len(order), batch_size):
+                rows = order[start : start + batch_size]
+                loss, d_mg, d_eg = features.gradient(params[0], params[1], k, rows)
+                total += loss
+                count += len(rows)
+                step += 1
+                for i, grad in enumerate((d_mg / len(rows), d_eg / len(rows))):
+                    moments[i] = beta1 * moments[i] + (1 - beta1) * grad
+                    squares[i] = beta2 * squares[i] + (1 - beta2) * grad * grad
+                    params[i] = params[i] - lr * (moments[i] / (1 - beta1**step)) / (
+                        np.sqrt(squares[i] / (1 - beta2**step)) + eps
+                    )
+        errors.append(total / count)
+        if log is not None:
+            log(f"epoch {epoch + 1}: error {errors[-1]:.6f}")
+    return params[0], params[1], errors
+
+
+def split_tables(values: np.ndarray) -> Tuple[List[int], List[List[int]]]:
+    """Split type * 64 + square values into material values and tables.
+
+    Material is the mean over the squares a piece can stand on (ranks 2-7
+    for pawns); the king keeps a material value of 0.
+    """
+    values = np.rint(values.reshape(6, 64)).astype(int)
+    material = []
+    tables = []
+    for ptype in range(6):
+        row = values[ptype].copy()
+        if ptype == 0:
+            row[:8] = row[56:] = 0
+            base = int(round(row[8:56].mean()))
+            row[8:56] -= base
+        elif ptype == 5:
+            base = 0
+        else:
+            base = int(round(row.mean()))
+            row -= base
+        material.append(base)
+        tables.append(row.tolist())
+    return material, tables
+
+
+def save(path: str, mg: np.ndarray, eg: np.ndarray):
+    mg_values, mg_tables = split_tables(mg)
+    eg_values, eg_tables = split_tables(eg)
+    pst.save_tables(path, mg_values, eg_values, mg_tables, eg_tables)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Tune the piece-square tables on labelled positions.")
+    parser.add_argument("files", nargs="+", help="files of FEN + result lines")
+    parser.add_argument("--out", default="chess_eval.json")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="positions parsed at a time")
+    parser.add_argument("--batch-size", type=int, default=16384)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--lr", type=float, default=1.0, help="Adam step size in centipawns")
+    parser.add_argument("--k", type=float, default=None, help="sigmoid scale (default: fitted)")
+    parser.add_argument("--init", help="tables to start from instead of the built-in ones")
+    args = parser.parse_args(argv)
+
+    if args.init:
+        pst.load_tables(args.init)
+    chunks = [Features(codes, results) for codes, results in read_chunks(args.files, args.chunk_size)]
+    print(f"{sum(len(f) for f in chunks)} positions in {len(chunks)} chunks")
+    mg, eg, _ = tune(chunks, args.epochs, args.batch_size, args.lr, args.k, log=print)
+    save(args.out, mg, eg)
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
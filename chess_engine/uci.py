@@ -0,0 +1,212 @@
+"""Universal Chess Interface front end.
+
+Run ``python -m chess_engine.uci`` and talk UCI on stdin/stdout, e.g. from
+a GUI or a tool such as cutechess-cli.  Supported commands are ``uci``,
+``isready``, ``ucinewgame``, ``setoption name Hash value <MB>``,
+``position [startpos | fen <FEN>] [moves ...]``, ``go`` with ``depth``,
+``movetime``, ``nodes``, ``wtime``/``btime``/``winc``/``binc``/
+``movestogo`` or ``infinite``, ``stop`` and ``quit``.  The search runs on
+a background thread so ``stop`` is handled while it thinks; an ``info``
+line with depth, score, nodes, nps, time and PV follows every completed
+iteration.  Nothing here imports pygame.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO
+
+from .bitboard import WHITE
+from .movegen import legal_moves
+from .ordering import MoveOrderer
+from .position import START_FEN, Position, move_to_uci
+from .search import MATE_BOUND, MATE_SCORE, MAX_DEPTH, Searcher
+from .tt import TranspositionTable
+
+ENGINE_NAME = "PythonArcade Chess"
+ENGINE_AUTHOR = "PythonArcade"
+
+DEFAULT_HASH_MB = 16
+
+
+def uci_score(score: int, side: int) -> str:
+    """``cp <n>`` or ``mate <moves>`` from the side to move's point of view."""
+    if side != WHITE:
+        score = -score
+    if abs(score) >= MATE_BOUND:
+        plies = MATE_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+def time_for_move(remaining_ms: int, increment_ms: int = 0, moves_to_go: Optional[int] = None) -> float:
+    """Seconds to spend on a move given the clock."""
+    moves = moves_to_go if moves_to_go else 30
+    budget = remaining_ms / moves + increment_ms * 0.75
+    # Never use more than most of what is left.
+    return max(0.01, min(budget, remaining_ms * 0.8 - 50) / 1000)
+
+
+class UCIEngine:
+    def __init__(self, out: TextIO = sys.stdout):
+        self.out = out
+        self.tt = TranspositionTable(DEFAULT_HASH_MB)
+        self.orderer = MoveOrderer()
+        self.position = Position.initial()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._infinite = False
+
+    def send(self, line: str):
+        self.out.write(line + "\n")
+        self.out.flush()
+
+    # -- commands -----------------------------------------------------------
+
+    def handle(self, line: str) -> bool:
+        """Process one command line; return False after ``quit``."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {DEFAULT_HASH_MB} min 1 max 1024")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self.stop()
+            self.tt.clear()
+            self.orderer = MoveOrderer()
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "position":
+            self.stop()
+            self.set_position(args)
+        elif command == "go":
+            self.go(args)
+        elif command == "stop":
+            self.stop()
+        elif command == "quit":
+            self.stop()
+            return False
+        return True
+
+    def set_option(self, args: List[str]):
+        if "name" not in args or "value" not in args:
+            return
+        name = " ".join(args[args.index("name") + 1 : args.index("value")]).lower()
+        value = " ".join(args[args.index("value") + 1 :])
+        if name == "hash":
+            try:
+                size = max(1, int(value))
+            except ValueError:
+                return
+            self.stop()
+            self.tt = TranspositionTable(size)
+
+    def set_position(self, args: List[str]):
+        moves: List[str] = []
+        if "moves" in args:
+            index = args.index("moves")
+            args, moves = args[:index], args[index + 1 :]
+        if args and args[0] == "fen":
+            try:
+                pos = Position.from_fen(" ".join(args[1:]))
+            except ValueError:
+                # Keep the previous position rather than search a broken one.
+                return
+        else:
+            pos = Position.from_fen(START_FEN)
+        for text in moves:
+            # A GUI may send an illegal move or the null move "0000"; the
+            # position stops at the last legal one.
+            move = {move_to_uci(m): m for m in legal_moves(pos)}.get(text.lower())
+            if move is None:
+                break
+            pos.make_move(move)
+        # Keep only the final position; the undo records are not needed.
+        pos.undo_stack = []
+        self.position = pos
+
+    def go(self, args: List[str]):
+        self.stop()
+        options = {}
+        for i, token in enumerate(args):
+            if i + 1 < len(args) and token in (
+                "depth", "movetime", "nodes", "wtime", "btime", "winc", "binc", "movestogo"
+            ):
+                try:
+                    options[token] = int(args[i + 1])
+                except ValueError:
+                    continue
+        max_depth = options.get("depth", MAX_DEPTH)
+        node_limit = options.get("nodes")
+        time_limit = None
+        if "movetime" in options:
+            time_limit = options["movetime"] / 1000
+        elif "infinite" not in args:
+            clock, inc = ("wtime", "winc") if self.position.side == WHITE else ("btime", "binc")
+            if clock in options:
+                time_limit = time_for_move(options[clock], options.get(inc, 0), options.get("movestogo"))
+        self._stop = threading.Event()
+        self._infinite = "infinite" in args
+        pos = self.position.copy()
+        self._thread = threading.Thread(
+            target=self._search,
+            args=(pos, max_depth, time_limit, node_limit, self._stop, self._infinite),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.wait()
+
+    def wait(self):
+        """Let the current search finish; an infinite one is stopped."""
+        if self._infinite:
+            self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # -- search ---------------------------------------------------------------
+
+    def _search(self, pos: Position, max_depth: int, time_limit, node_limit, stop: threading.Event, infinite: bool):
+        self.tt.new_search()
+        self.orderer.new_search()
+        searcher = Searcher(self.tt, self.orderer)
+        searcher.stop_event = stop
+        start = time.perf_counter()
+
+        def report(searcher: Searcher, depth: int, score: int):
+            elapsed = time.perf_counter() - start
+            self.send(
+                f"info depth {depth} score {uci_score(score, pos.side)} nodes {searcher.nodes} "
+                f"nps {int(searcher.nodes / elapsed) if elapsed else 0} time {int(elapsed * 1000)} "
+                f"pv {' '.join(move_to_uci(m) for m in searcher.pv)}"
+            )
+
+        searcher.on_iteration = report
+        _, move, _ = searcher.iterative_deepening(pos, max_depth, time_limit, node_limit)
+        if infinite:
+            # UCI sends the best move of an infinite search only after "stop".
+            stop.wait()
+        self.send(f"bestmove {move_to_uci(move) if move is not None else '0000'}")
+
+
+def main(stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout):
+    engine = UCIEngine(stdout)
+    for line in stdin:
+        if not engine.handle(line):
+            break
+    engine.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Run the computer player on a background thread.
+
+The pygame loop has to keep drawing and handling events while the engine
+thinks, so :class:`SearchWorker` runs :meth:`AIPlayer.choose_move` on a
+daemon thread and the UI polls for the result once per frame.  A running
+search can be cancelled, e.g. when the user takes a move back.
+
+With pondering enabled the worker keeps searching after the AI has moved,
+on the position after the reply it expects.  The search is stopped as
+soon as the user moves; its only purpose is to leave the transposition
+table warm for the real search.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Optional
+
+from .rules import GameState, Move
+from .search import AIPlayer
+
+
+class SearchWorker:
+    def __init__(self, ai: AIPlayer, ponder: bool = False):
+        self.ai = ai
+        self.ponder_enabled = ponder
+        self.pondering = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._result: Optional[Move] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def thinking(self) -> bool:
+        """True while a move search (not pondering) is running or unpolled."""
+        return not self.pondering and (self.busy or self._result is not None)
+
+    def start(self, state: GameState):
+        """Start searching for a move in ``state``; collect it with :meth:`poll`."""
+        state = state.copy()
+
+        def think(stop: threading.Event):
+            move = self.ai.choose_move(state, stop_event=stop)
+            if not stop.is_set():
+                self._result = move
+
+        self._run(think, pondering=False)
+
+    def start_ponder(self, state: GameState):
+        """Ponder on ``state`` with the opponent to move, if enabled."""
+        if not self.ponder_enabled:
+            return
+        state = state.copy()
+        self._run(lambda stop: self.ai.ponder(state, stop), pondering=True)
+
+    def poll(self) -> Optional[Move]:
+        """Return the finished move once, or None while still searching."""
+        if self.pondering or self.busy or self._result is None:
+            return None
+        move, self._result = self._result, None
+        return move
+
+    def cancel(self):
+        """Stop any search or ponder and discard its result."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._result = None
+        self.pondering = False
+
+    def _run(self, target: Callable[[threading.Event], object], pondering: bool):
+        self.cancel()
+        # Each job gets its own event so a cancelled thread can never see
+        # the flag cleared again by the next job.
+        self._stop = threading.Event()
+        self.pondering = pondering
+        self._thread = threading.Thread(target=target, args=(self._stop,), daemon=True)
+        self._thread.start()
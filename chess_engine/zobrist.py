@@ -0,0 +1,32 @@
+"""Zobrist hashing keys.
+
+The keys come from a fixed seed so that hashes are identical across runs
+and processes, which lets hash-indexed data be shared or stored on disk.
+"""
+from __future__ import annotations
+
+import random
+
+from .bitboard import BLACK, EMPTY, NO_SQUARE
+
+_rng = random.Random(0x5EED_C4E55)
+
+# PIECE_KEYS[piece * 64 + square]
+PIECE_KEYS = [_rng.getrandbits(64) for _ in range(12 * 64)]
+SIDE_KEY = _rng.getrandbits(64)  # xored in when black is to move
+CASTLING_KEYS = [0] + [_rng.getrandbits(64) for _ in range(15)]  # indexed by rights mask
+EP_KEYS = [_rng.getrandbits(64) for _ in range(8)]  # indexed by file
+
+
+def compute_key(pos) -> int:
+    """Hash a position from scratch."""
+    key = 0
+    for sq, piece in enumerate(pos.mailbox):
+        if piece != EMPTY:
+            key ^= PIECE_KEYS[piece * 64 + sq]
+    if pos.side == BLACK:
+        key ^= SIDE_KEY
+    key ^= CASTLING_KEYS[pos.castling]
+    if pos.ep != NO_SQUARE:
+        key ^= EP_KEYS[pos.ep & 7]
+    return key